@@ -0,0 +1,69 @@
+"""
+Фоновый расчёт ходов ИИ
+Поиск идёт в отдельном потоке, результат возвращается в поток интерфейса
+через функцию post (в приложении - Clock.schedule_once). Отменённые и
+устаревшие результаты отбрасываются
+"""
+
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+from search import CancelToken
+
+
+def call_now(callback):
+    """post по умолчанию: вызвать сразу в потоке расчёта"""
+    callback()
+
+
+class AIWorker:
+    """Один фоновый поток для ходов ИИ; новая задача отменяет предыдущую"""
+
+    def __init__(self, post=call_now):
+        self.post = post
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='ai')
+        self.token = CancelToken()
+
+    def submit(self, compute, callback):
+        """Запускает compute(token) в фоне и передаёт результат в callback(result, elapsed)
+
+        Если compute упал, callback получает None. Возвращает токен задачи:
+        если он отменён, callback не вызывается.
+        """
+        self.cancel()
+        token = self.token
+        started = time.perf_counter()
+
+        def run():
+            if token.cancelled:
+                return None
+            return compute(token)
+
+        def done(future):
+            elapsed = time.perf_counter() - started
+            self.post(lambda: self.deliver(future, token, callback, elapsed))
+
+        self.executor.submit(run).add_done_callback(done)
+        return token
+
+    def deliver(self, future, token, callback, elapsed):
+        """Выполняется в потоке интерфейса"""
+        if token.cancelled or token is not self.token:
+            return
+        error = future.exception()
+        if error is not None:
+            # Вызывающий всё равно узнаёт о конце расчёта, иначе интерфейс ждёт хода вечно
+            traceback.print_exception(error)
+            callback(None, elapsed)
+            return
+        callback(future.result(), elapsed)
+
+    def cancel(self):
+        """Прерывает текущий расчёт; его результат будет отброшен"""
+        self.token.cancel()
+        self.token = CancelToken()
+
+    def shutdown(self):
+        self.cancel()
+        self.executor.shutdown(wait=False)
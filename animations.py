@@ -0,0 +1,70 @@
+"""
+Анимации интерфейса: последовательности собираются один раз на эффект
+и переиспользуются для любых виджетов
+
+Перед запуском эффекта его незаконченная анимация на том же виджете
+отменяется, поэтому частые касания и быстрые перезапуски не накладывают
+анимации друг на друга. Число идущих анимаций доступно для профилирования.
+Модуль нужен только интерфейсу (Kivy)
+"""
+
+from kivy.animation import Animation
+
+
+def press_effect():
+    return Animation(scale=0.95, duration=0.1) + Animation(scale=1, duration=0.1)
+
+
+def pop_effect():
+    return Animation(pop_scale=8 / 7, duration=0.2) + Animation(pop_scale=1, duration=0.1)
+
+
+def highlight_effect():
+    return Animation(highlight=0.7, duration=0.5)
+
+
+# Эффект -> (построение анимации, значения свойств в покое)
+EFFECTS = {
+    'press': (press_effect, {'scale': 1}),
+    'pop': (pop_effect, {'pop_scale': 1}),
+    'highlight': (highlight_effect, {'highlight': 0}),
+}
+
+
+class AnimationManager:
+    """Запуск, отмена и учёт анимаций по эффектам"""
+
+    def __init__(self, effects=EFFECTS):
+        self.animations = {}
+        self.rest = {}
+        # (эффект, uid виджета) -> виджет, пока анимация идёт
+        self.active = {}
+        for name, (build, rest) in effects.items():
+            animation = build()
+            animation.bind(on_complete=lambda animation, widget, name=name:
+                           self.active.pop((name, widget.uid), None))
+            self.animations[name] = animation
+            self.rest[name] = rest
+
+    @property
+    def active_count(self):
+        return len(self.active)
+
+    def play(self, name, widget):
+        """Запускает эффект на виджете, отменив его прежний запуск"""
+        self.cancel(name, widget)
+        self.active[name, widget.uid] = widget
+        self.animations[name].start(widget)
+
+    def cancel(self, name, widget):
+        """Останавливает эффект там, где он сейчас, без on_complete"""
+        if self.active.pop((name, widget.uid), None) is not None:
+            self.animations[name].cancel(widget)
+
+    def reset(self, widget):
+        """Отменяет все эффекты на виджете и возвращает их свойства в покой"""
+        for name, rest in self.rest.items():
+            self.cancel(name, widget)
+            for prop, value in rest.items():
+                if hasattr(widget, prop):
+                    setattr(widget, prop, value)
@@ -0,0 +1,212 @@
+"""
+Компактное хранение множества партий 3x3 для сервера
+Каждая партия - одно 64-битное слово в общем array('Q'):
+
+  биты  0..8   клетки X
+  биты  9..17  клетки O
+  бит   18     режим против ИИ
+  бит   19     слот занят
+  биты 20..55  порядок ходов, по 4 бита на ход
+
+Чей ход, число ходов, победитель и конец игры вычисляются из клеток,
+поэтому отдельно не хранятся. Правила и ответ ИИ - общие: слот читается
+как BitBoard (board) и записывается обратно (store). Так же сервер
+хранит позиции своих партий 3x3. Объект партии (ArenaSession) - лёгкий
+вид на слот и создаётся только по запросу
+
+Запуск бенчмарка памяти: python arena.py [партий]
+"""
+
+import sys
+import tracemalloc
+from array import array
+
+from engine import BitBoard, FULL_MASK
+from game import GameController, simple_move
+
+O_SHIFT = 9
+AI_FLAG = 1 << 18
+USED_FLAG = 1 << 19
+LOG_SHIFT = 20
+BOARD_MASK = (1 << 18) - 1
+
+
+class SessionArena:
+    """Пул партий 3x3 в одном массиве; освобождённые слоты переиспользуются"""
+
+    __slots__ = ('words', 'free', 'live')
+
+    def __init__(self):
+        self.words = array('Q')
+        self.free = array('I')
+        self.live = 0
+
+    def __len__(self):
+        return self.live
+
+    def create(self, mode='friend'):
+        """Новая партия; возвращает её номер"""
+        word = USED_FLAG | (AI_FLAG if mode == 'ai' else 0)
+        if self.free:
+            index = self.free.pop()
+            self.words[index] = word
+        else:
+            index = len(self.words)
+            self.words.append(word)
+        self.live += 1
+        return index
+
+    def release(self, index):
+        self.check(index)
+        self.words[index] = 0
+        self.free.append(index)
+        self.live -= 1
+
+    def check(self, index):
+        if not 0 <= index < len(self.words) or not self.words[index] & USED_FLAG:
+            raise KeyError(f"Партия не найдена: {index}")
+        return self.words[index]
+
+    def session(self, index):
+        self.check(index)
+        return ArenaSession(self, index)
+
+    # ---------- Разбор слова ----------
+
+    @staticmethod
+    def unpack(word):
+        return word & FULL_MASK, word >> O_SHIFT & FULL_MASK
+
+    def bits(self, index):
+        return self.unpack(self.check(index))
+
+    def mode(self, index):
+        return 'ai' if self.check(index) & AI_FLAG else 'friend'
+
+    def move_count(self, index):
+        return (self.check(index) & BOARD_MASK).bit_count()
+
+    def current_player(self, index):
+        return 'O' if self.move_count(index) % 2 else 'X'
+
+    def winner(self, index):
+        return self.board(index).winner()
+
+    def game_over(self, index):
+        board = self.board(index)
+        return board.winner() is not None or board.is_full()
+
+    def cells(self, index):
+        return self.board(index).cells()
+
+    def moves(self, index):
+        """Ходы партии по порядку"""
+        word = self.check(index)
+        log = word >> LOG_SHIFT
+        return [log >> 4 * i & 0xF for i in range((word & BOARD_MASK).bit_count())]
+
+    def board(self, index):
+        """Партия как BitBoard с историей ходов"""
+        x, o = self.bits(index)
+        board = BitBoard(x, o)
+        board.history = self.moves(index)
+        return board
+
+    def store(self, index, board):
+        """Записывает BitBoard в слот; история должна содержать все ходы позиции"""
+        word = self.check(index) & (AI_FLAG | USED_FLAG) | board.x | board.o << O_SHIFT
+        for i, position in enumerate(board.history):
+            word |= position << LOG_SHIFT + 4 * i
+        self.words[index] = word
+
+    # ---------- Ходы ----------
+
+    def place(self, index, position):
+        """Ставит знак текущего игрока; False, если ход невозможен"""
+        board = self.board(index)
+        if not isinstance(position, int) or not board.make_move(position):
+            return False
+        self.store(index, board)
+        return True
+
+    def make_move(self, index, position):
+        """Ход с ответом ИИ в режиме ai; сообщения как у GameController"""
+        board = self.board(index)
+        if board.winner() is not None or board.is_full():
+            return False, "Игра завершена"
+        if not isinstance(position, int) or not board.make_move(position):
+            return False, "Неверный ход"
+        self.store(index, board)
+
+        winner = board.winner()
+        if winner:
+            return True, f"Победил {winner}"
+        if board.is_full():
+            return True, "Ничья"
+
+        if self.words[index] & AI_FLAG and board.current_player == 'O':
+            return self.make_move(index, simple_move(board))
+        return True, "Ход принят"
+
+    def reset(self, index):
+        self.words[index] = self.check(index) & (AI_FLAG | USED_FLAG)
+
+
+class ArenaSession:
+    """Вид на партию в арене с интерфейсом GameController"""
+
+    __slots__ = ('arena', 'index')
+
+    def __init__(self, arena, index):
+        self.arena = arena
+        self.index = index
+
+    mode = property(lambda self: self.arena.mode(self.index))
+    current_player = property(lambda self: self.arena.current_player(self.index))
+    winner = property(lambda self: self.arena.winner(self.index))
+    game_over = property(lambda self: self.arena.game_over(self.index))
+    move_count = property(lambda self: self.arena.move_count(self.index))
+    cells = property(lambda self: self.arena.cells(self.index))
+
+    def make_move(self, position):
+        return self.arena.make_move(self.index, position)
+
+    def reset(self):
+        self.arena.reset(self.index)
+
+
+def bytes_per_game(factory, count):
+    """Прирост памяти на одну живую партию по tracemalloc"""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        games = factory(count)
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del games
+    return (after - before) / count
+
+
+def controller_games(count):
+    """Партии GameController после первого хода игрока и ответа ИИ"""
+    games = [GameController('ai') for _ in range(count)]
+    for game in games:
+        game.make_move(0)
+    return games
+
+
+def arena_games(count):
+    """То же в SessionArena"""
+    arena = SessionArena()
+    for _ in range(count):
+        arena.make_move(arena.create('ai'), 0)
+    return arena
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    # GameController меряется на меньшей выборке: миллион объектов слишком долго строится
+    sample = min(count, 100_000)
+    print(f"GameController: {bytes_per_game(controller_games, sample):.0f} байт на партию ({sample} партий)")
+    print(f"SessionArena:   {bytes_per_game(arena_games, count):.1f} байт на партию ({count} партий)")
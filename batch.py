@@ -0,0 +1,131 @@
+"""
+Пакетный симулятор: N партий 3x3 одновременно в массиве NumPy (N, 9)
+Клетки: 0 - пусто, 1 - X, -1 - O. Все партии идут в одном темпе,
+поэтому очередь хода общая для пакета
+
+Замер скорости: python batch.py [число партий]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from engine import WIN_LINES
+from opening_book import NO_ENTRY
+
+EMPTY, X, O = 0, 1, -1
+
+# LINE_MATRIX[i, j] = 1, если клетка i входит в линию j
+LINE_MATRIX = np.zeros((9, len(WIN_LINES)), dtype=np.int8)
+for _j, _line in enumerate(WIN_LINES):
+    LINE_MATRIX[list(_line), _j] = 1
+
+POW3 = 3 ** np.arange(9, dtype=np.int32)
+
+# Порядок SimpleAI: центр, углы, остальные по возрастанию
+SIMPLE_PRIORITY = (4, 0, 2, 6, 8, 1, 3, 5, 7)
+SIMPLE_WEIGHTS = np.zeros(9, dtype=np.float64)
+for _rank, _cell in enumerate(SIMPLE_PRIORITY):
+    SIMPLE_WEIGHTS[_cell] = 9 - _rank
+
+
+def line_sums(boards):
+    """Суммы по 8 линиям одним матричным умножением, форма (N, 8)"""
+    return boards.astype(np.int16) @ LINE_MATRIX.astype(np.int16)
+
+
+def winners(boards):
+    """1 - победил X, -1 - победил O, 0 - победителя нет"""
+    sums = line_sums(boards)
+    result = np.zeros(len(boards), dtype=np.int8)
+    result[(sums == 3).any(axis=1)] = X
+    result[(sums == -3).any(axis=1)] = O
+    return result
+
+
+def random_policy(boards, player, rng):
+    """Случайная свободная клетка в каждой партии"""
+    noise = rng.random(boards.shape)
+    noise[boards != EMPTY] = -1.0
+    return noise.argmax(axis=1)
+
+
+def simple_policy(boards, player, rng):
+    """Векторный аналог SimpleAI: центр, углы, первая свободная"""
+    weights = np.where(boards == EMPTY, SIMPLE_WEIGHTS, -1.0)
+    return weights.argmax(axis=1)
+
+
+def book_policy(book):
+    """Политика по книге ходов: одно чтение из массива на партию"""
+    table = np.frombuffer(book.data, dtype=np.uint8)
+
+    def policy(boards, player, rng):
+        digits = np.where(boards == X, 1, np.where(boards == O, 2, 0)).astype(np.int32)
+        entries = table[digits @ POW3]
+        moves = (entries & 0x0F).astype(np.int64)
+        # В законченных партиях записи нет - ход всё равно не применится
+        moves[entries == NO_ENTRY] = 0
+        return moves
+
+    return policy
+
+
+class BatchGames:
+    """Пакет одновременных партий"""
+
+    def __init__(self, n):
+        self.boards = np.zeros((n, 9), dtype=np.int8)
+        self.winner = np.zeros(n, dtype=np.int8)
+        self.done = np.zeros(n, dtype=bool)
+        self.ply = 0
+
+    @property
+    def player(self):
+        return X if self.ply % 2 == 0 else O
+
+    def step(self, moves):
+        """Ставит фигуры в незаконченных партиях и обновляет итоги"""
+        active = ~self.done
+        rows = np.nonzero(active)[0]
+        cols = np.asarray(moves)[rows]
+        if (self.boards[rows, cols] != EMPTY).any():
+            raise ValueError("Ход в занятую клетку")
+        self.boards[rows, cols] = self.player
+        self.ply += 1
+
+        self.winner[active] = winners(self.boards[active])
+        self.done |= self.winner != 0
+        if self.ply == 9:
+            self.done[:] = True
+
+    def play(self, policy_x, policy_o=None, rng=None):
+        """Доигрывает все партии до конца"""
+        rng = rng if rng is not None else np.random.default_rng()
+        policy_o = policy_o or policy_x
+        while not self.done.all():
+            policy = policy_x if self.player == X else policy_o
+            self.step(policy(self.boards, self.player, rng))
+        return self.results()
+
+    def results(self):
+        return {
+            'x_wins': int((self.winner == X).sum()),
+            'o_wins': int((self.winner == O).sum()),
+            'draws': int((self.done & (self.winner == 0)).sum()),
+        }
+
+
+def simulate(n, policy_x=random_policy, policy_o=None, seed=None):
+    """Играет n партий сразу и возвращает счёт"""
+    return BatchGames(n).play(policy_x, policy_o, np.random.default_rng(seed))
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    started = time.perf_counter()
+    results = simulate(n)
+    elapsed = time.perf_counter() - started
+    print(f"Партий: {n}, время: {elapsed:.2f} c, партий в секунду: {n / elapsed:.0f}")
+    print(results)
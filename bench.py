@@ -0,0 +1,270 @@
+"""
+Бенчмарки игры: микро (проверка победы, поиск выигрышного хода),
+ход ИИ, целые партии без интерфейса, построение экрана, время кадра
+во время анимации хода и холодный импорт
+
+Результаты выводятся в JSON и сравниваются с сохранённой базой:
+замер хуже базы больше чем на порог - регрессия, код выхода 1.
+Если базы ещё нет, текущие результаты сохраняются как база
+
+Запуск: python main.py bench [вывод.json] [база.json] [порог]
+    или python bench.py [вывод.json] [база.json] [порог]
+"""
+
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+
+from engine import BitBoard
+from game import GameController, check_winner, choose_ai_move, find_winning_move
+from mnk import make_board
+from search import search_move
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bench_baseline.json')
+
+# Допустимое ухудшение относительно базы (0.5 - на 50%);
+# на общих виртуальных машинах замеры между запусками гуляют на треть
+THRESHOLD = 0.5
+
+REPEAT = 5
+
+BENCHMARKS = {}
+
+
+def benchmark(name, unit='s', better='lower'):
+    """Регистрирует бенчмарк; функция возвращает одно число в единицах unit"""
+    def decorator(func):
+        BENCHMARKS[name] = (func, unit, better)
+        return func
+    return decorator
+
+
+def per_call(func, number, repeat=REPEAT):
+    """Время одного вызова func: лучшая из repeat серий по number вызовов
+
+    Минимум, как в timeit: шум планировщика только добавляет время.
+    """
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        times.append((time.perf_counter() - started) / number)
+    return min(times)
+
+
+def sample_boards(count=200, seed=0):
+    """Позиции 3x3 из случайных партий, включая законченные"""
+    rng = random.Random(seed)
+    boards = []
+    while len(boards) < count:
+        board = BitBoard()
+        while board.winner() is None and not board.is_full():
+            board.make_move(rng.choice(board.legal_moves()))
+            boards.append(board.copy())
+    return boards[:count]
+
+
+# ========== МИКРОБЕНЧМАРКИ ==========
+
+@benchmark('check_winner')
+def bench_check_winner():
+    boards = sample_boards()
+    return per_call(lambda: [check_winner(board) for board in boards], 50) / len(boards)
+
+
+@benchmark('find_winning_move')
+def bench_find_winning_move():
+    boards = sample_boards()
+    return per_call(lambda: [find_winning_move(board, 'O') for board in boards], 50) / len(boards)
+
+
+# ========== ИИ И ПАРТИИ ==========
+
+@benchmark('ai_move_3x3')
+def bench_ai_move_3x3():
+    """Ход точного решателя с прогретой таблицей, как в приложении после первой партии"""
+    boards = [board for board in sample_boards() if board.winner() is None and not board.is_full()]
+    return per_call(lambda: [choose_ai_move(board) for board in boards], 5) / len(boards)
+
+
+@benchmark('ai_move_15x15')
+def bench_ai_move_15x15():
+    """Полный ход поиска по времени на 15x15 (бюджет + накладные расходы)"""
+    board = make_board(15, 15, 5)
+    for position in (112, 113, 97, 127):
+        board.make_move(position)
+    return per_call(lambda: search_move(board, budget=0.02), 1)
+
+
+@benchmark('games_per_second', unit='games/s', better='higher')
+def bench_games():
+    """Целые партии GameController против ИИ без интерфейса"""
+    rng = random.Random(1)
+
+    def play():
+        game = GameController('ai')
+        while not game.game_over:
+            free = [i for i, cell in enumerate(game.board.cells) if not cell]
+            game.make_move(rng.choice(free))
+
+    return 1 / per_call(play, 200)
+
+
+# ========== ИНТЕРФЕЙС И ИМПОРТ ==========
+
+@benchmark('build_game_screen')
+def bench_build_game_screen():
+    """Построение экрана игры в новом приложении и перенастройка на 15x15 и обратно"""
+    # Иначе Kivy примет аргументы бенчмарка за свои
+    os.environ.setdefault('KIVY_NO_ARGS', '1')
+    from kivy.uix.screenmanager import ScreenManager
+    from ui import GameScreen, TicTacToeApp
+
+    def build():
+        app = TicTacToeApp()
+        try:
+            app.sm = ScreenManager()
+            app.game_screen = GameScreen(name='game')
+            app.sm.add_widget(app.game_screen)
+            app.build_game_screen()
+            for rows, cols, k in ((15, 15, 5), (3, 3, 3)):
+                app.resize(rows, cols, k)
+                app.configure_game_screen()
+        finally:
+            app.on_stop()
+
+    return per_call(build, 1)
+
+
+@benchmark('move_animation_frame')
+def bench_move_animation_frame():
+    """Среднее время кадра (анимации и отрисовка окна), пока идёт анимация хода"""
+    os.environ.setdefault('KIVY_NO_ARGS', '1')
+    from kivy.base import EventLoop
+    from kivy.clock import Clock
+    from kivy.uix.screenmanager import ScreenManager
+    from ui import GameScreen, TicTacToeApp
+
+    EventLoop.ensure_window()
+    window = EventLoop.window
+    app = TicTacToeApp()
+    app.sm = ScreenManager()
+    app.game_screen = GameScreen(name='game')
+    app.sm.add_widget(app.game_screen)
+    window.add_widget(app.sm)
+    # Без ограничения fps кадр не ждёт таймер, и замеряется только его работа
+    max_fps, Clock._max_fps = Clock._max_fps, 0
+    frames = 0
+    elapsed = 0.0
+    try:
+        app.start_game('friend')
+        # Восемь ходов без победы: анимации хода длятся 0.3 с
+        for position in (0, 1, 2, 4, 3, 5, 7, 6):
+            app.make_move(position)
+            until = time.perf_counter() + 0.3
+            while time.perf_counter() < until:
+                started = time.perf_counter()
+                EventLoop.idle()
+                elapsed += time.perf_counter() - started
+                frames += 1
+    finally:
+        Clock._max_fps = max_fps
+        window.remove_widget(app.sm)
+        app.on_stop()
+    return elapsed / frames
+
+
+def cold_import(module, repeat=REPEAT):
+    """Время импорта модуля в новом интерпретаторе"""
+    code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+    directory = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ, KIVY_NO_CONSOLELOG='1', KIVY_NO_ARGS='1')
+    times = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', code], cwd=directory, env=env,
+                                capture_output=True, text=True, check=True).stdout
+        times.append(float(output.split()[-1]))
+    return min(times)
+
+
+@benchmark('import_game')
+def bench_import_game():
+    return cold_import('game')
+
+
+@benchmark('import_ui')
+def bench_import_ui():
+    return cold_import('ui')
+
+
+# ========== ЗАПУСК И СРАВНЕНИЕ ==========
+
+def run_benchmarks(names=None):
+    results = {}
+    for name in names or BENCHMARKS:
+        func, unit, better = BENCHMARKS[name]
+        try:
+            value = func()
+        except ImportError as e:
+            # Kivy не установлен - экранные замеры пропускаются
+            print(f"{name}: пропущен ({e})", file=sys.stderr)
+            continue
+        results[name] = {'value': value, 'unit': unit, 'better': better}
+    return {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'results': results,
+    }
+
+
+def compare(report, baseline, threshold=THRESHOLD):
+    """Список регрессий (имя, значение, база, изменение в долях)"""
+    regressions = []
+    for name, result in report['results'].items():
+        base = baseline['results'].get(name)
+        if base is None or not base['value']:
+            continue
+        change = result['value'] / base['value'] - 1
+        if result['better'] == 'higher':
+            change = base['value'] / result['value'] - 1 if result['value'] else float('inf')
+        if change > threshold:
+            regressions.append((name, result['value'], base['value'], change))
+    return regressions
+
+
+def main(args=()):
+    """Прогон бенчмарков; возвращает код выхода"""
+    output = args[0] if len(args) > 0 else None
+    baseline_path = args[1] if len(args) > 1 else BASELINE_PATH
+    threshold = float(args[2]) if len(args) > 2 else THRESHOLD
+
+    report = run_benchmarks()
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    print(text)
+
+    if not os.path.exists(baseline_path):
+        with open(baseline_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        print(f"База сохранена: {baseline_path}")
+        return 0
+
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions = compare(report, baseline, threshold)
+    for name, value, base, change in regressions:
+        print(f"РЕГРЕССИЯ {name}: {value:.6g} против {base:.6g} (+{change:.0%})")
+    if not regressions:
+        print(f"Регрессий нет (порог {threshold:.0%})")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
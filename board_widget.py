@@ -0,0 +1,243 @@
+"""
+Игровое поле одним виджетом: сетка, знаки и подсветка победной линии
+рисуются инструкциями canvas, касание переводится в клетку арифметикой
+
+Поле рисуется в координатах клеток (клетка 1x1) под одними Translate
+и Scale, поэтому смена размера или положения меняет две инструкции,
+сколько бы клеток ни было. Сетка - один прямоугольник с повторяющейся
+текстурой клетки, инструкции заводятся только для занятых клеток.
+
+render() сравнивает позицию с последней нарисованной и трогает только
+отличающиеся клетки: так рисуются новая партия, отмена, повтор записи
+и состояние с сервера. Модуль нужен только интерфейсу (Kivy)
+"""
+
+from kivy.core.text import Label as CoreLabel
+from kivy.graphics import (Color, InstructionGroup, PopMatrix, PushMatrix, Rectangle,
+                           Scale, Translate)
+from kivy.graphics.texture import Texture
+from kivy.properties import NumericProperty
+from kivy.uix.widget import Widget
+
+EMPTY_COLOR = (0.15, 0.15, 0.15, 1)
+GRID_COLOR = (0, 0, 0, 1)
+PLAYER_COLORS = {'X': (0.8, 0.2, 0.2, 1), 'O': (0.2, 0.2, 0.8, 1)}
+HIGHLIGHT_COLOR = (0, 1, 0)
+
+# Клетка доски ('', 'X', 'O') или состояния сервера ('.', 'X', 'O') -> знак
+SYMBOLS = {'': '', '.': '', 'X': 'X', 'O': 'O'}
+
+# Текстура клетки сетки: TILE x TILE пикселей, по краям - полоса зазора
+TILE = 32
+TILE_BORDER = 1
+
+# Зазор между клетками и высота текстуры знака - в долях клетки
+GAP = 2 * TILE_BORDER / TILE
+MARK_HEIGHT = 0.8
+
+# Текстуры X и O растеризуются один раз в этом размере, дальше только масштабируются
+GLYPH_SIZE = 128
+GLYPHS = {}
+
+
+def glyph_texture(glyph):
+    """Текстура знака; при смене размера поля или анимации текст не перерисовывается"""
+    texture = GLYPHS.get(glyph)
+    if texture is None:
+        label = CoreLabel(text=glyph, font_size=GLYPH_SIZE)
+        label.refresh()
+        texture = GLYPHS[glyph] = label.texture
+    return texture
+
+
+def cell_tile():
+    """Повторяющаяся текстура пустой клетки; сглаживание держит линии ровными на любом поле"""
+    fill = bytes(int(c * 255) for c in EMPTY_COLOR)
+    border = bytes(int(c * 255) for c in GRID_COLOR)
+    pixels = bytearray()
+    for y in range(TILE):
+        for x in range(TILE):
+            edge = min(x, y, TILE - 1 - x, TILE - 1 - y) < TILE_BORDER
+            pixels += border if edge else fill
+    texture = Texture.create(size=(TILE, TILE), colorfmt='rgba')
+    texture.blit_buffer(bytes(pixels), colorfmt='rgba', bufferfmt='ubyte')
+    texture.wrap = 'repeat'
+    return texture
+
+
+def cell_at(x, y, left, top, cell, rows, cols):
+    """Номер клетки под точкой или None; left и top - верхний левый угол поля"""
+    if cell <= 0:
+        return None
+    col = int((x - left) // cell)
+    row = int((top - y) // cell)
+    if 0 <= row < rows and 0 <= col < cols:
+        return row * cols + col
+    return None
+
+
+class BoardWidget(Widget):
+    """Поле rows x cols; касание свободной или занятой клетки - событие on_cell(позиция)"""
+
+    rows = NumericProperty(3)
+    cols = NumericProperty(3)
+    # Масштаб последнего поставленного знака (анимация хода)
+    pop_scale = NumericProperty(1)
+    # Непрозрачность подсветки победной линии
+    highlight = NumericProperty(0)
+
+    __events__ = ('on_cell',)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        # Позиция -> (цвет клетки, фон клетки, знак)
+        self.cells = {}
+        # Нарисованная позиция и победная линия - с ними сравнивает render()
+        self.rendered = [''] * (self.rows * self.cols)
+        self.line = ()
+        self.last = None
+        self.cell = 0
+        self.left = self.top_edge = 0
+        self.fills = InstructionGroup()
+        self.highlights = InstructionGroup()
+        self.marks = InstructionGroup()
+        self.marks.add(Color(1, 1, 1, 1))
+        with self.canvas:
+            PushMatrix()
+            self.translate = Translate()
+            self.zoom = Scale()
+            Color(1, 1, 1, 1)
+            self.grid = Rectangle(texture=cell_tile())
+        self.canvas.add(self.fills)
+        self.highlight_color = Color(*HIGHLIGHT_COLOR, 0)
+        self.canvas.add(self.highlight_color)
+        self.canvas.add(self.highlights)
+        self.canvas.add(self.marks)
+        self.canvas.add(PopMatrix())
+        self.build_grid()
+        self.layout()
+        self.bind(pos=self.layout, size=self.layout)
+
+    # ========== РАЗМЕТКА ==========
+
+    def resize(self, rows, cols):
+        """Другой размер поля: сетка перестраивается, знаки и подсветка снимаются"""
+        if (rows, cols) == (self.rows, self.cols):
+            return
+        self.clear()
+        self.rows, self.cols = rows, cols
+        self.rendered = [''] * (rows * cols)
+        self.build_grid()
+        self.layout()
+
+    def build_grid(self):
+        """Текстура клетки повторяется cols x rows раз"""
+        rows, cols = self.rows, self.cols
+        self.grid.size = (cols, rows)
+        self.grid.tex_coords = (0, 0, cols, 0, cols, rows, 0, rows)
+
+    def layout(self, *args):
+        """Квадратные клетки по центру виджета; меняются только Translate и Scale"""
+        self.cell = min(self.width / self.cols, self.height / self.rows)
+        self.left = self.x + (self.width - self.cell * self.cols) / 2
+        bottom = self.y + (self.height - self.cell * self.rows) / 2
+        self.top_edge = bottom + self.cell * self.rows
+        self.translate.xy = (self.left, bottom)
+        self.zoom.x = self.zoom.y = self.cell
+
+    def cell_origin(self, position):
+        """Нижний левый угол клетки в координатах клеток"""
+        row, col = divmod(position, self.cols)
+        return col, self.rows - 1 - row
+
+    # ========== ЗНАКИ ==========
+
+    def render(self, cells, line=()):
+        """Приводит поле к позиции cells и победной линии line
+
+        Перерисовываются только клетки, отличные от нарисованных;
+        возвращает их список
+        """
+        changed = [position for position, (old, new) in enumerate(zip(self.rendered, cells))
+                   if old != SYMBOLS[new]]
+        for position in changed:
+            self.set_cell(position, SYMBOLS[cells[position]])
+        line = tuple(line)
+        if line != self.line:
+            self.set_line(line)
+        return changed
+
+    def set_cell(self, position, player):
+        """Рисует знак игрока в клетке; пустая строка очищает клетку"""
+        self.rendered[position] = player
+        old = self.cells.pop(position, None)
+        if old is not None:
+            color, fill, mark = old
+            self.fills.remove(color)
+            self.fills.remove(fill)
+            self.marks.remove(mark)
+        if not player:
+            return
+        x, y = self.cell_origin(position)
+        color = Color(*PLAYER_COLORS[player])
+        fill = Rectangle(pos=(x + GAP / 2, y + GAP / 2), size=(1 - GAP, 1 - GAP))
+        mark = Rectangle(texture=glyph_texture(player))
+        self.fills.add(color)
+        self.fills.add(fill)
+        self.marks.add(mark)
+        self.cells[position] = (color, fill, mark)
+        self.place_mark(position, self.pop_scale if position == self.last else 1)
+
+    def place_mark(self, position, scale):
+        mark = self.cells[position][2]
+        x, y = self.cell_origin(position)
+        texture = mark.texture
+        height = MARK_HEIGHT * scale
+        width = height * texture.width / texture.height
+        mark.pos = (x + (1 - width) / 2, y + (1 - height) / 2)
+        mark.size = (width, height)
+
+    def pop(self, position):
+        """Делает клетку последним ходом: её знак дальше масштабируется по pop_scale"""
+        self.pop_scale = 1
+        if self.last in self.cells:
+            self.place_mark(self.last, 1)
+        self.last = position
+
+    def on_pop_scale(self, instance, value):
+        if self.last in self.cells:
+            self.place_mark(self.last, value)
+
+    def clear(self):
+        for position in list(self.cells):
+            self.set_cell(position, '')
+        self.last = None
+        self.set_line(())
+
+    # ========== ПОДСВЕТКА ==========
+
+    def set_line(self, line):
+        """Клетки победной линии; видимость задаёт highlight"""
+        self.line = tuple(line)
+        self.highlights.clear()
+        for position in line:
+            x, y = self.cell_origin(position)
+            self.highlights.add(Rectangle(pos=(x + GAP / 2, y + GAP / 2), size=(1 - GAP, 1 - GAP)))
+        if not line:
+            self.highlight = 0
+
+    def on_highlight(self, instance, value):
+        self.highlight_color.a = value
+
+    # ========== КАСАНИЯ ==========
+
+    def on_touch_down(self, touch):
+        if not self.collide_point(*touch.pos):
+            return super().on_touch_down(touch)
+        position = cell_at(touch.x, touch.y, self.left, self.top_edge, self.cell, self.rows, self.cols)
+        if position is not None:
+            self.dispatch('on_cell', position)
+        return True
+
+    def on_cell(self, position):
+        pass
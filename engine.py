@@ -0,0 +1,178 @@
+"""
+Битбордовый движок крестиков-ноликов
+Позиция хранится как два 9-битных числа: клетки X и клетки O
+"""
+
+# Бит i соответствует клетке i (0..8, построчно слева направо)
+FULL_MASK = 0b111111111
+
+WIN_LINES = (
+    (0, 1, 2), (3, 4, 5), (6, 7, 8),
+    (0, 3, 6), (1, 4, 7), (2, 5, 8),
+    (0, 4, 8), (2, 4, 6)
+)
+
+WIN_MASKS = tuple(sum(1 << i for i in line) for line in WIN_LINES)
+
+PLAYERS = ('X', 'O')
+
+CORNERS = (0, 2, 6, 8)
+CENTER = 4
+
+
+def has_win(bits):
+    """Есть ли в наборе клеток полная линия"""
+    for mask in WIN_MASKS:
+        if bits & mask == mask:
+            return True
+    return False
+
+
+def winning_mask(bits):
+    """Маска первой собранной линии или 0"""
+    for mask in WIN_MASKS:
+        if bits & mask == mask:
+            return mask
+    return 0
+
+
+def completing_cells(own, other):
+    """Маска пустых клеток, ход в которые сразу даёт победу"""
+    empty = ~(own | other) & FULL_MASK
+    result = 0
+    for mask in WIN_MASKS:
+        rest = mask & ~own
+        # Линия выигрывается, если в ней не хватает ровно одной пустой клетки
+        if rest & empty == rest and rest and rest & (rest - 1) == 0:
+            result |= rest
+    return result
+
+
+def bits_to_cells(bits):
+    """Список номеров клеток, занятых в маске"""
+    return [i for i in range(9) if bits >> i & 1]
+
+
+def lowest_cell(bits):
+    """Номер младшей занятой клетки маски или None"""
+    if not bits:
+        return None
+    return (bits & -bits).bit_length() - 1
+
+
+class BitBoard:
+    """Позиция на доске 3x3 с историей ходов для отмены"""
+
+    __slots__ = ('x', 'o', 'history')
+
+    # Общий интерфейс с досками m,n,k
+    rows = cols = k = 3
+    size = 9
+    center = CENTER
+    corners = CORNERS
+
+    def __init__(self, x=0, o=0):
+        self.x = x
+        self.o = o
+        self.history = []
+
+    @classmethod
+    def from_cells(cls, cells):
+        """Создаёт позицию из списка строк '', 'X', 'O'"""
+        x = o = 0
+        for i, cell in enumerate(cells):
+            if cell == 'X':
+                x |= 1 << i
+            elif cell == 'O':
+                o |= 1 << i
+        return cls(x, o)
+
+    def cells(self):
+        """Позиция в виде списка строк '', 'X', 'O'"""
+        x, o = self.x, self.o
+        return ['X' if x >> i & 1 else 'O' if o >> i & 1 else '' for i in range(9)]
+
+    def __getitem__(self, position):
+        if self.x >> position & 1:
+            return 'X'
+        if self.o >> position & 1:
+            return 'O'
+        return ''
+
+    def __len__(self):
+        return 9
+
+    def copy(self):
+        board = BitBoard(self.x, self.o)
+        board.history = self.history[:]
+        return board
+
+    def reset(self):
+        self.x = 0
+        self.o = 0
+        self.history.clear()
+
+    @property
+    def occupied(self):
+        return self.x | self.o
+
+    @property
+    def move_count(self):
+        return (self.x | self.o).bit_count()
+
+    @property
+    def current_player(self):
+        """Чей ход по числу фигур: X ходит первым"""
+        return 'X' if self.x.bit_count() == self.o.bit_count() else 'O'
+
+    def is_empty(self, position):
+        return not (self.x | self.o) >> position & 1
+
+    def make_move(self, position, player=None):
+        """Ставит фигуру в клетку, возвращает False для занятой или неверной клетки"""
+        if not 0 <= position < 9:
+            return False
+        bit = 1 << position
+        if (self.x | self.o) & bit:
+            return False
+        if player is None:
+            player = self.current_player
+        if player == 'X':
+            self.x |= bit
+        else:
+            self.o |= bit
+        self.history.append(position)
+        return True
+
+    def undo(self):
+        """Отменяет последний ход, возвращает номер клетки или None"""
+        if not self.history:
+            return None
+        position = self.history.pop()
+        bit = ~(1 << position)
+        self.x &= bit
+        self.o &= bit
+        return position
+
+    def winner(self):
+        if has_win(self.x):
+            return 'X'
+        if has_win(self.o):
+            return 'O'
+        return None
+
+    def winning_line(self):
+        """Клетки собранной линии или None"""
+        mask = winning_mask(self.x) or winning_mask(self.o)
+        return bits_to_cells(mask) if mask else None
+
+    def is_full(self):
+        return self.x | self.o == FULL_MASK
+
+    def legal_moves(self):
+        return bits_to_cells(~(self.x | self.o) & FULL_MASK)
+
+    def winning_move(self, player):
+        """Младшая клетка, дающая игроку победу одним ходом, или None"""
+        own, other = (self.x, self.o) if player == 'X' else (self.o, self.x)
+        return lowest_cell(completing_cells(own, other))
@@ -0,0 +1,339 @@
+"""
+Логика игры без Kivy: общая для приложения, тестов и серверных процессов
+"""
+
+import random
+
+from engine import BitBoard
+from mnk import board_from_cells, make_board
+from search import search_move
+
+# Бюджет времени ИИ на больших полях, секунд
+AI_BUDGET = 0.05
+
+
+# ========== ФУНКЦИИ ДЛЯ ЛЮБОЙ ДОСКИ ==========
+
+def check_winner(board):
+    return board.winner()
+
+
+def find_winning_move(board, player):
+    return board.winning_move(player)
+
+
+def take_center(board):
+    return board.center if board.is_empty(board.center) else None
+
+
+def take_corner(board, rng=random):
+    available_corners = [c for c in board.corners if board.is_empty(c)]
+    return rng.choice(available_corners) if available_corners else None
+
+
+def heuristic_move(board, rng=random):
+    """Эвристика: выигрыш, блок, центр, случайный угол, случайный ход"""
+    available_moves = board.legal_moves()
+    if not available_moves:
+        return None
+    player = board.current_player
+    move = find_winning_move(board, player)
+    if move is None:
+        move = find_winning_move(board, 'O' if player == 'X' else 'X')
+    if move is None:
+        move = take_center(board)
+    if move is None:
+        move = take_corner(board, rng)
+    if move is None:
+        move = rng.choice(available_moves)
+    return move
+
+
+def simple_move(board):
+    """Логика SimpleAI: центр, потом углы, потом первая доступная"""
+    available = board.legal_moves()
+    if not available:
+        return None
+    if board.center in available:
+        return board.center
+    for corner in board.corners:
+        if corner in available:
+            return corner
+    return available[0]
+
+
+def choose_ai_move(board, book=None, token=None, budget=AI_BUDGET):
+    """Ход ИИ: книга или точный решатель на 3x3, поиск по времени на больших полях"""
+    if not isinstance(board, BitBoard):
+        return search_move(board, budget, token).move
+    if book is not None:
+        return book.best_move(board)[0]
+    # Таблицы симметрий решателя строятся при импорте: приложению они нужны не при старте
+    from solver import best_move
+    return best_move(board)[0]
+
+
+def board_key(board):
+    """Размер поля для статистики: 'rowsxcolsxk'"""
+    return f'{board.rows}x{board.cols}x{board.k}'
+
+
+def undo_turn(board, redo_stack, ai=False):
+    """Отменяет ход, запоминая его для повтора; против ИИ - до хода игрока X
+
+    Возвращает список изменившихся клеток. Каждый шаг - board.undo(), без копий доски.
+    """
+    undone = []
+    while board.history:
+        position = board.history[-1]
+        redo_stack.append((position, board[position]))
+        board.undo()
+        undone.append(position)
+        if not ai or board.current_player == 'X':
+            break
+    return undone
+
+
+def redo_turn(board, redo_stack, ai=False):
+    """Повторяет отменённые ходы; против ИИ - вместе с ответом ИИ"""
+    redone = []
+    while redo_stack:
+        position, player = redo_stack.pop()
+        board.make_move(position, player)
+        redone.append(position)
+        if not ai or board.current_player == 'X':
+            break
+    return redone
+
+
+# ========== СОСТОЯНИЕ ПАРТИИ ПРИЛОЖЕНИЯ ==========
+
+class TicTacToeGame:
+    """Состояние и правила партии без интерфейса
+
+    Приложение наследует этот класс вместе с kivy.app.App, поэтому
+    конструктор передаёт аргументы дальше по цепочке наследования.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.engine = BitBoard()
+        self.book = None
+        self.current_player = 'X'
+        self.game_active = True
+        self.player_x_score = 0
+        self.player_o_score = 0
+        self.ties = 0
+        self.game_mode = 'friend'
+        # Отменённые ходы (клетка, игрок); новый ход очищает стек
+        self.redo_stack = []
+        # StatsStore для сохранения итогов или None
+        self.stats = None
+        # Номер последнего запроса итогов: ответы на прежние запросы отбрасываются
+        self.scores_request = 0
+
+    @property
+    def board(self):
+        """Позиция в виде списка строк"""
+        return self.engine.cells()
+
+    @board.setter
+    def board(self, cells):
+        engine = self.engine
+        self.engine = board_from_cells(cells, engine.rows, engine.cols, engine.k)
+        self.redo_stack.clear()
+
+    def resize(self, rows, cols, k):
+        """Меняет размер поля, если он другой"""
+        if (self.engine.rows, self.engine.cols, self.engine.k) != (rows, cols, k):
+            self.engine = make_board(rows, cols, k)
+            self.redo_stack.clear()
+
+    def check_winner(self):
+        return check_winner(self.engine)
+
+    def find_winning_move(self, player):
+        return find_winning_move(self.engine, player)
+
+    def take_center(self):
+        return take_center(self.engine)
+
+    def take_corner(self):
+        return take_corner(self.engine)
+
+    def choose_ai_move(self, token=None):
+        return choose_ai_move(self.engine, self.book, token)
+
+    def switch_player(self):
+        self.current_player = 'O' if self.current_player == 'X' else 'X'
+
+    def place(self, position):
+        """Ход текущего игрока; False, если клетка занята"""
+        if not self.engine.make_move(position, self.current_player):
+            return False
+        self.redo_stack.clear()
+        return True
+
+    def undo(self):
+        """Отменяет ход (против ИИ - и ответ ИИ); возвращает изменившиеся клетки"""
+        changed = undo_turn(self.engine, self.redo_stack, self.game_mode == 'ai')
+        self.sync_turn()
+        return changed
+
+    def redo(self):
+        """Повторяет отменённый ход; возвращает изменившиеся клетки"""
+        changed = redo_turn(self.engine, self.redo_stack, self.game_mode == 'ai')
+        self.sync_turn()
+        return changed
+
+    def sync_turn(self):
+        """Очередь хода и активность партии по позиции на доске"""
+        self.current_player = self.engine.current_player
+        self.game_active = self.engine.winner() is None and not self.engine.is_full()
+
+    def update_score(self, winner):
+        if winner == 'X':
+            self.player_x_score += 1
+        else:
+            self.player_o_score += 1
+
+    def record_result(self, winner):
+        """Сохраняет итог партии (None - ничья); запись идёт в фоне"""
+        if self.stats is not None:
+            self.stats.record(self.game_mode, board_key(self.engine), winner or 'draw')
+
+    def load_scores(self):
+        """Обнуляет счёт и запрашивает сохранённые итоги режима и поля"""
+        self.player_x_score = self.player_o_score = self.ties = 0
+        self.scores_request += 1
+        request = self.scores_request
+        if self.stats is not None:
+            self.stats.totals(self.game_mode, board_key(self.engine),
+                              lambda totals: self.receive_totals(request, totals))
+
+    def receive_totals(self, request, totals):
+        # Ответ на запрос прежней партии (другой режим или поле) опоздал - счёт не его
+        if request == self.scores_request:
+            self.add_totals(totals)
+
+    def add_totals(self, totals):
+        # Итоги прибавляются: партии, сыгранные до ответа базы, не теряются
+        self.player_x_score += totals['X']
+        self.player_o_score += totals['O']
+        self.ties += totals['draw']
+
+    def reset_game(self, instance=None):
+        self.engine.reset()
+        self.redo_stack.clear()
+        self.game_active = True
+        self.current_player = 'X'
+
+
+# ========== УПРОЩЕННЫЙ КОНТРОЛЛЕР БЕЗ ИНТЕРФЕЙСА ==========
+
+class GameBoard:
+    __slots__ = ('state',)
+
+    def __init__(self, rows=3, cols=3, k=3):
+        self.state = make_board(rows, cols, k)
+
+    @property
+    def cells(self):
+        return self.state.cells()
+
+    def make_move(self, position, player):
+        return self.state.make_move(position, player)
+
+    def check_winner(self):
+        return self.state.winner()
+
+    def is_full(self):
+        return self.state.is_full()
+
+    def reset(self):
+        self.state.reset()
+
+
+class SimpleAI:
+    __slots__ = ()
+
+    def get_move(self, board):
+        return simple_move(board.state)
+
+
+class GameController:
+    __slots__ = ('board', 'ai', 'mode', 'current_player', 'game_over', 'winner', 'move_count', 'redo_stack')
+
+    def __init__(self, mode='friend', rows=3, cols=3, k=3):
+        self.board = GameBoard(rows, cols, k)
+        self.ai = SimpleAI()
+        self.mode = mode
+        self.current_player = 'X'
+        self.game_over = False
+        self.winner = None
+        self.move_count = 0
+        self.redo_stack = []
+
+    def make_move(self, position):
+        if self.game_over:
+            return False, "Игра завершена"
+
+        if not self.board.make_move(position, self.current_player):
+            return False, "Неверный ход"
+
+        self.redo_stack.clear()
+        self.move_count += 1
+
+        # Проверяем победителя
+        self.winner = self.board.check_winner()
+        if self.winner:
+            self.game_over = True
+            return True, f"Победил {self.winner}"
+
+        # Проверяем ничью
+        if self.board.is_full():
+            self.game_over = True
+            return True, "Ничья"
+
+        # Меняем игрока
+        self.current_player = 'O' if self.current_player == 'X' else 'X'
+
+        # Если режим с ИИ и сейчас ход ИИ
+        if self.mode == 'ai' and self.current_player == 'O' and not self.game_over:
+            return self.make_ai_move()
+
+        return True, "Ход принят"
+
+    def make_ai_move(self):
+        ai_position = self.ai.get_move(self.board)
+        if ai_position is not None:
+            return self.make_move(ai_position)
+        return False, "ИИ не может сделать ход"
+
+    def undo(self):
+        """Отменяет последний ход; против ИИ - вместе с ответом ИИ"""
+        if not undo_turn(self.board.state, self.redo_stack, self.mode == 'ai'):
+            return False, "Нечего отменять"
+        self.sync()
+        return True, "Ход отменён"
+
+    def redo(self):
+        if not redo_turn(self.board.state, self.redo_stack, self.mode == 'ai'):
+            return False, "Нечего повторять"
+        self.sync()
+        return True, "Ход повторён"
+
+    def sync(self):
+        state = self.board.state
+        self.current_player = state.current_player
+        self.move_count = len(state.history)
+        self.winner = state.winner()
+        self.game_over = self.winner is not None or state.is_full()
+
+    def reset(self):
+        self.board.reset()
+        self.redo_stack.clear()
+        self.current_player = 'X'
+        self.game_over = False
+        self.winner = None
+        self.move_count = 0
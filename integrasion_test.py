@@ -1,105 +1,10 @@
+from engine import BitBoard
+from game import GameController, check_winner, find_winning_move
+
 print("=" * 80)
 print("ИНТЕГРАЦИОННОЕ ТЕСТИРОВАНИЕ")
 print("=" * 80)
 
-# ========== УПРОЩЕННЫЕ КОМПОНЕНТЫ ДЛЯ ТЕСТИРОВАНИЯ ==========
-
-class GameBoard:
-    def __init__(self):
-        self.cells = [''] * 9
-    
-    def make_move(self, position, player):
-        if 0 <= position < 9 and self.cells[position] == '':
-            self.cells[position] = player
-            return True
-        return False
-    
-    def check_winner(self):
-        lines = [
-            [0,1,2],[3,4,5],[6,7,8],
-            [0,3,6],[1,4,7],[2,5,8],
-            [0,4,8],[2,4,6]
-        ]
-        for line in lines:
-            if self.cells[line[0]] == self.cells[line[1]] == self.cells[line[2]] != '':
-                return self.cells[line[0]]
-        return None
-    
-    def is_full(self):
-        return all(cell != '' for cell in self.cells)
-    
-    def reset(self):
-        self.cells = [''] * 9
-
-class SimpleAI:
-    def get_move(self, board):
-        available = [i for i, cell in enumerate(board.cells) if cell == '']
-        if not available:
-            return None
-        
-        # Простая логика: сначала центр, потом углы, потом остальное
-        if 4 in available:
-            return 4
-        
-        corners = [0, 2, 6, 8]
-        for corner in corners:
-            if corner in available:
-                return corner
-        
-        return available[0]  # первая доступная
-
-class GameController:
-    def __init__(self, mode='friend'):
-        self.board = GameBoard()
-        self.ai = SimpleAI()
-        self.mode = mode
-        self.current_player = 'X'
-        self.game_over = False
-        self.winner = None
-        self.move_count = 0
-    
-    def make_move(self, position):
-        if self.game_over:
-            return False, "Игра завершена"
-        
-        if not self.board.make_move(position, self.current_player):
-            return False, "Неверный ход"
-        
-        self.move_count += 1
-        
-        # Проверяем победителя
-        self.winner = self.board.check_winner()
-        if self.winner:
-            self.game_over = True
-            return True, f"Победил {self.winner}"
-        
-        # Проверяем ничью
-        if self.board.is_full():
-            self.game_over = True
-            return True, "Ничья"
-        
-        # Меняем игрока
-        self.current_player = 'O' if self.current_player == 'X' else 'X'
-        
-        # Если режим с ИИ и сейчас ход ИИ
-        if self.mode == 'ai' and self.current_player == 'O' and not self.game_over:
-            return self.make_ai_move()
-        
-        return True, "Ход принят"
-    
-    def make_ai_move(self):
-        ai_position = self.ai.get_move(self.board)
-        if ai_position is not None:
-            return self.make_move(ai_position)
-        return False, "ИИ не может сделать ход"
-    
-    def reset(self):
-        self.board.reset()
-        self.current_player = 'X'
-        self.game_over = False
-        self.winner = None
-        self.move_count = 0
-
 # ========== ПРОСТЫЕ И НАДЕЖНЫЕ ТЕСТЫ ==========
 
 def run_simple_integration_tests():
@@ -243,6 +148,28 @@ def run_simple_integration_tests():
         print(f"   ❌ ПРОВАЛЕН: {e}")
         tests.append(False)
     
+    # ТЕСТ 6: Большое поле 15x15, 5 в ряд
+    print("\n6. Тест: Поле 15x15, 5 в ряд")
+    try:
+        game = GameController('friend', 15, 15, 5)
+        
+        # X строит диагональ, O ходит в первую строку
+        for i in range(4):
+            game.make_move(16 * (i + 3))
+            game.make_move(i)
+        assert game.winner is None, f"Рано для победы, а есть {game.winner}"
+        
+        success, msg = game.make_move(16 * 7)
+        assert success, f"Ход не удался: {msg}"
+        assert game.winner == 'X', f"Победитель должен быть X, а не {game.winner}"
+        assert game.board.state.winning_line() == [48, 64, 80, 96, 112], "Неверная линия"
+        
+        print("   ✅ ПРОЙДЕН")
+        tests.append(True)
+    except AssertionError as e:
+        print(f"   ❌ ПРОВАЛЕН: {e}")
+        tests.append(False)
+    
     # ========== РЕЗУЛЬТАТЫ ==========
     print("\n" + "=" * 60)
     print("РЕЗУЛЬТАТЫ:")
@@ -357,34 +284,13 @@ def test_with_real_game_logic():
     print("ТЕСТ С РЕАЛЬНОЙ ЛОГИКОЙ ИГРЫ")
     print("=" * 60)
     
-    # Берем функции прямо из твоего кода
-    def check_winner(board):
-        lines = [
-            [0,1,2],[3,4,5],[6,7,8],
-            [0,3,6],[1,4,7],[2,5,8],
-            [0,4,8],[2,4,6]
-        ]
-        for line in lines:
-            if board[line[0]] == board[line[1]] == board[line[2]] != '':
-                return board[line[0]]
-        return None
-    
-    def find_winning_move(board, player):
-        for i in range(9):
-            if board[i] == '':
-                board[i] = player
-                if check_winner(board) == player:
-                    board[i] = ''
-                    return i
-                board[i] = ''
-        return None
-    
+    # Функции берутся из общего модуля game, доска - битборд движка
     tests = []
     
     print("\n1. Тест check_winner:")
     # Тест 1: X побеждает
     board = ['X', 'X', 'X', '', '', '', '', '', '']
-    result = check_winner(board)
+    result = check_winner(BitBoard.from_cells(board))
     if result == 'X':
         print("   ✅ X побеждает по горизонтали")
         tests.append(True)
@@ -394,7 +300,7 @@ def test_with_real_game_logic():
     
     # Тест 2: O побеждает по вертикали
     board = ['O', '', '', 'O', '', '', 'O', '', '']
-    result = check_winner(board)
+    result = check_winner(BitBoard.from_cells(board))
     if result == 'O':
         print("   ✅ O побеждает по вертикали")
         tests.append(True)
@@ -404,7 +310,7 @@ def test_with_real_game_logic():
     
     # Тест 3: Нет победителя
     board = ['X', 'O', 'X', '', '', '', '', '', '']
-    result = check_winner(board)
+    result = check_winner(BitBoard.from_cells(board))
     if result is None:
         print("   ✅ Нет победителя")
         tests.append(True)
@@ -415,7 +321,7 @@ def test_with_real_game_logic():
     print("\n2. Тест find_winning_move:")
     # Тест 4: ИИ находит победный ход
     board = ['O', 'O', '', '', '', '', '', '', '']
-    move = find_winning_move(board, 'O')
+    move = find_winning_move(BitBoard.from_cells(board), 'O')
     if move == 2:
         print("   ✅ ИИ находит победный ход (позиция 2)")
         tests.append(True)
@@ -425,7 +331,7 @@ def test_with_real_game_logic():
     
     # Тест 5: ИИ блокирует игрока
     board = ['X', 'X', '', '', '', '', '', '', '']
-    move = find_winning_move(board, 'X')
+    move = find_winning_move(BitBoard.from_cells(board), 'X')
     if move == 2:
         print("   ✅ ИИ видит угрозу игрока (позиция 2)")
         tests.append(True)
@@ -0,0 +1,106 @@
+"""
+Нагрузочный тест игрового сервера на loopback
+Каждый клиент создаёт партию против ИИ и делает случайные допустимые ходы
+до конца игры; измеряется задержка каждого хода (запрос -> ответ)
+
+Запуск: python loadtest.py [клиентов] [одновременных соединений]
+"""
+
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import namedtuple
+
+from opening_book import open_book
+from server import GameServer
+
+LoadResult = namedtuple('LoadResult', 'clients moves elapsed moves_per_second p50 p99 errors')
+
+
+def open_files_limit():
+    try:
+        import resource
+    except ImportError:
+        return 1024
+    return resource.getrlimit(resource.RLIMIT_NOFILE)[0]
+
+
+def default_concurrency(clients):
+    """Каждое соединение занимает два дескриптора: клиента и сервера"""
+    return max(1, min(clients, (open_files_limit() - 64) // 2))
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+async def request(reader, writer, message):
+    writer.write(json.dumps(message).encode() + b'\n')
+    await writer.drain()
+    return json.loads(await reader.readline())
+
+
+async def play_client(port, rng, latencies):
+    """Одна партия против ИИ; возвращает число ошибок (ответов и соединений)"""
+    try:
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    except OSError:
+        return 1
+    errors = 0
+    try:
+        state = await request(reader, writer, {'op': 'create', 'mode': 'ai'})
+        session = state['session']
+        while not state['over']:
+            empty = [i for i, cell in enumerate(state['cells']) if cell == '.']
+            started = time.perf_counter()
+            reply = await request(reader, writer, {'op': 'move', 'session': session, 'position': rng.choice(empty)})
+            latencies.append(time.perf_counter() - started)
+            if not reply['ok']:
+                errors += 1
+                break
+            state = reply
+    except (ConnectionError, ValueError):
+        errors += 1
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+    return errors
+
+
+async def run_load(clients=10000, concurrency=None, seed=None, book=None):
+    server = GameServer(book)
+    port = await server.start()
+    rng = random.Random(seed)
+    semaphore = asyncio.Semaphore(concurrency or default_concurrency(clients))
+    latencies = []
+
+    async def client():
+        async with semaphore:
+            return await play_client(port, random.Random(rng.random()), latencies)
+
+    started = time.perf_counter()
+    try:
+        errors = sum(await asyncio.gather(*(client() for _ in range(clients))))
+    finally:
+        await server.stop()
+    elapsed = time.perf_counter() - started
+    moves = len(latencies)
+    return LoadResult(clients, moves, elapsed, moves / elapsed if elapsed else 0.0,
+                      percentile(latencies, 0.5), percentile(latencies, 0.99), errors)
+
+
+if __name__ == '__main__':
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else default_concurrency(clients)
+    result = asyncio.run(run_load(clients, concurrency, book=open_book()))
+    print(f"Клиентов: {result.clients}, одновременно: {concurrency}, ходов: {result.moves}, ошибок: {result.errors}")
+    print(f"Время: {result.elapsed:.2f} c, ходов в секунду: {result.moves_per_second:.0f}")
+    print(f"Задержка хода: p50 {result.p50 * 1000:.2f} мс, p99 {result.p99 * 1000:.2f} мс")
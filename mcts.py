@@ -0,0 +1,168 @@
+"""
+Поиск Монте-Карло по дереву (UCT) для досок любого размера
+Розыгрыши можно распараллелить по процессам: каждый процесс строит
+своё дерево от корня, статистика корневых ходов складывается
+
+Замер скорости: python mcts.py [розыгрыши] [процессы] [размер поля]
+"""
+
+import math
+import os
+import random
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from mnk import board_from_cells, make_board
+from search import candidate_moves
+
+EXPLORATION = 1.4
+
+MCTSResult = namedtuple('MCTSResult', 'move playouts elapsed playouts_per_second stats')
+
+
+class Node:
+    __slots__ = ('move', 'parent', 'player', 'children', 'untried', 'visits', 'wins')
+
+    def __init__(self, move, parent, player, untried):
+        self.move = move
+        self.parent = parent
+        # Игрок, сделавший ход move; wins считаются для него
+        self.player = player
+        self.children = []
+        self.untried = untried
+        self.visits = 0
+        self.wins = 0.0
+
+    def select_child(self, exploration):
+        log_visits = math.log(self.visits)
+        best, best_value = None, -1.0
+        for child in self.children:
+            value = child.wins / child.visits + exploration * math.sqrt(log_visits / child.visits)
+            if value > best_value:
+                best, best_value = child, value
+        return best
+
+
+def opponent_of(player):
+    return 'O' if player == 'X' else 'X'
+
+
+def rollout(board, rng):
+    """Случайная доигровка; возвращает победителя или None и откатывает ходы"""
+    moves = board.legal_moves()
+    rng.shuffle(moves)
+    played = 0
+    winner = board.winner()
+    for move in moves:
+        if winner is not None:
+            break
+        board.make_move(move)
+        played += 1
+        winner = board.winner()
+    for _ in range(played):
+        board.undo()
+    return winner
+
+
+class MCTS:
+    """UCT на одном процессе"""
+
+    def __init__(self, playouts=1000, exploration=EXPLORATION, seed=None):
+        self.playouts = playouts
+        self.exploration = exploration
+        self.rng = random.Random(seed)
+
+    def run(self, board):
+        """Статистика корневых ходов {ход: (посещения, победы)}"""
+        rng = self.rng
+        root = Node(None, None, opponent_of(board.current_player), self.expand_moves(board))
+        for _ in range(self.playouts):
+            node = root
+            depth = 0
+            # Выбор
+            while not node.untried and node.children:
+                node = node.select_child(self.exploration)
+                board.make_move(node.move, node.player)
+                depth += 1
+            # Расширение
+            if node.untried and board.winner() is None:
+                move = node.untried.pop(rng.randrange(len(node.untried)))
+                player = opponent_of(node.player)
+                board.make_move(move, player)
+                depth += 1
+                child = Node(move, node, player, self.expand_moves(board))
+                node.children.append(child)
+                node = child
+            # Доигровка
+            winner = rollout(board, rng)
+            for _ in range(depth):
+                board.undo()
+            # Обратное распространение
+            while node is not None:
+                node.visits += 1
+                if winner is None:
+                    node.wins += 0.5
+                elif winner == node.player:
+                    node.wins += 1
+                node = node.parent
+        return {child.move: (child.visits, child.wins) for child in root.children}
+
+    @staticmethod
+    def expand_moves(board):
+        if board.winner() is not None or board.is_full():
+            return []
+        return candidate_moves(board)
+
+
+def _worker(rows, cols, k, cells, playouts, exploration, seed):
+    """Розыгрыши в отдельном процессе на восстановленной доске"""
+    board = board_from_cells(cells, rows, cols, k)
+    return MCTS(playouts, exploration, seed).run(board)
+
+
+def merge_stats(results):
+    stats = {}
+    for result in results:
+        for move, (visits, wins) in result.items():
+            total_visits, total_wins = stats.get(move, (0, 0.0))
+            stats[move] = (total_visits + visits, total_wins + wins)
+    return stats
+
+
+def mcts_move(board, playouts=1000, workers=1, exploration=EXPLORATION, seed=None, executor=None):
+    """Лучший ход по числу посещений; workers > 1 - параллельно от корня
+
+    executor можно передать, чтобы не поднимать пул процессов на каждый ход.
+    """
+    started = time.perf_counter()
+    if workers <= 1 and executor is None:
+        stats = MCTS(playouts, exploration, seed).run(board)
+    else:
+        rng = random.Random(seed)
+        share, extra = divmod(playouts, workers)
+        args = [
+            (board.rows, board.cols, board.k, board.cells(),
+             share + (i < extra), exploration, rng.randrange(1 << 30))
+            for i in range(workers)
+        ]
+        if executor is not None:
+            stats = merge_stats(executor.map(_worker, *zip(*args)))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                stats = merge_stats(pool.map(_worker, *zip(*args)))
+    elapsed = time.perf_counter() - started
+    move = max(stats, key=lambda m: stats[m][0]) if stats else None
+    return MCTSResult(move, playouts, elapsed, playouts / elapsed if elapsed else 0.0, stats)
+
+
+if __name__ == '__main__':
+    playouts = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1
+    size = int(sys.argv[3]) if len(sys.argv) > 3 else 15
+    board = make_board(size, size, 5 if size >= 5 else size)
+    board.make_move(board.center)
+    result = mcts_move(board, playouts, workers)
+    print(f"Ход: {result.move}, розыгрышей: {result.playouts}, процессов: {workers}")
+    print(f"Время: {result.elapsed:.2f} c, розыгрышей в секунду: {result.playouts_per_second:.0f}")
@@ -0,0 +1,168 @@
+"""
+Движок для досок m,n,k: поле rows x cols, побеждает линия из k фигур
+Победа проверяется только по четырём направлениям через последний ход
+"""
+
+from engine import BitBoard
+
+EMPTY, X, O = 0, 1, 2
+SYMBOLS = ('', 'X', 'O')
+CODES = {'': EMPTY, 'X': X, 'O': O}
+
+# Горизонталь, вертикаль и две диагонали
+DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+# Варианты поля для меню: (строки, столбцы, длина линии, подпись)
+BOARD_VARIANTS = (
+    (3, 3, 3, '3×3'),
+    (7, 7, 4, '7×7, 4 в ряд'),
+    (15, 15, 5, '15×15, 5 в ряд'),
+    (19, 19, 5, '19×19, 5 в ряд'),
+)
+
+
+class MNKBoard:
+    """Позиция на доске rows x cols с историей ходов для отмены"""
+
+    __slots__ = ('rows', 'cols', 'k', 'size', 'grid', 'history', 'line')
+
+    def __init__(self, rows=15, cols=15, k=5):
+        if k > max(rows, cols):
+            raise ValueError(f"Линия {k} не помещается на поле {rows}x{cols}")
+        if k < 1:
+            raise ValueError(f"Длина линии должна быть не меньше 1: {k}")
+        self.rows = rows
+        self.cols = cols
+        self.k = k
+        self.size = rows * cols
+        self.grid = bytearray(self.size)
+        self.history = []
+        # Собранная последним ходом линия или None
+        self.line = None
+
+    def cells(self):
+        """Позиция в виде списка строк '', 'X', 'O'"""
+        return [SYMBOLS[code] for code in self.grid]
+
+    def __getitem__(self, position):
+        return SYMBOLS[self.grid[position]]
+
+    def __len__(self):
+        return self.size
+
+    def copy(self):
+        board = MNKBoard(self.rows, self.cols, self.k)
+        board.grid[:] = self.grid
+        board.history = self.history[:]
+        board.line = self.line
+        return board
+
+    def reset(self):
+        self.grid[:] = bytes(self.size)
+        self.history.clear()
+        self.line = None
+
+    @property
+    def center(self):
+        return (self.rows // 2) * self.cols + self.cols // 2
+
+    @property
+    def corners(self):
+        last = self.size - 1
+        return (0, self.cols - 1, last - self.cols + 1, last)
+
+    @property
+    def move_count(self):
+        return len(self.history)
+
+    @property
+    def current_player(self):
+        return 'X' if len(self.history) % 2 == 0 else 'O'
+
+    def is_empty(self, position):
+        return self.grid[position] == EMPTY
+
+    def make_move(self, position, player=None):
+        """Ставит фигуру и проверяет линии через эту клетку"""
+        if not 0 <= position < self.size or self.grid[position] != EMPTY:
+            return False
+        if player is None:
+            player = self.current_player
+        self.grid[position] = CODES[player]
+        self.history.append(position)
+        if self.line is None:
+            self.line = self.line_through(position)
+        return True
+
+    def undo(self):
+        """Отменяет последний ход, возвращает номер клетки или None"""
+        if not self.history:
+            return None
+        position = self.history.pop()
+        self.grid[position] = EMPTY
+        # Партия на доске m,n,k заканчивается первой линией, значит её собрал этот ход
+        self.line = None
+        return position
+
+    def line_through(self, position):
+        """Клетки линии длиной не меньше k через клетку position или None"""
+        grid = self.grid
+        code = grid[position]
+        if code == EMPTY:
+            return None
+        rows, cols, k = self.rows, self.cols, self.k
+        row, col = divmod(position, cols)
+        for dr, dc in DIRECTIONS:
+            line = [position]
+            for sign in (1, -1):
+                r, c = row + dr * sign, col + dc * sign
+                while 0 <= r < rows and 0 <= c < cols and grid[r * cols + c] == code:
+                    line.append(r * cols + c)
+                    r += dr * sign
+                    c += dc * sign
+            if len(line) >= k:
+                return sorted(line)
+        return None
+
+    def winner(self):
+        if self.line is None:
+            return None
+        return SYMBOLS[self.grid[self.line[0]]]
+
+    def winning_line(self):
+        return self.line
+
+    def is_full(self):
+        return len(self.history) == self.size
+
+    def legal_moves(self):
+        return [i for i, code in enumerate(self.grid) if code == EMPTY]
+
+    def winning_move(self, player):
+        """Младшая клетка, дающая игроку победу одним ходом, или None"""
+        grid = self.grid
+        code = CODES[player]
+        for position in range(self.size):
+            if grid[position] == EMPTY:
+                grid[position] = code
+                line = self.line_through(position)
+                grid[position] = EMPTY
+                if line is not None:
+                    return position
+        return None
+
+
+def make_board(rows=3, cols=3, k=3):
+    """Доска нужного размера: для классики - битборд, иначе m,n,k"""
+    if (rows, cols, k) == (3, 3, 3):
+        return BitBoard()
+    return MNKBoard(rows, cols, k)
+
+
+def board_from_cells(cells, rows=3, cols=3, k=3):
+    """Доска нужного размера с фигурами из списка строк '', 'X', 'O'"""
+    board = make_board(rows, cols, k)
+    for position, cell in enumerate(cells):
+        if cell:
+            board.make_move(position, cell)
+    return board
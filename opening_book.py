@@ -0,0 +1,138 @@
+"""
+Предрасчитанная книга ходов для всех достижимых позиций 3x3
+Файл - массив из 3^9 байт, индекс - троичная запись позиции
+(пусто 0, X 1, O 2; клетка i - разряд 3^i)
+
+Байт записи: младшие 4 бита - лучший ход, биты 4-5 - оценка + 1,
+NO_ENTRY - позиция недостижима или партия уже закончена.
+
+Сборка: python opening_book.py [путь]
+"""
+
+import mmap
+import os
+import sys
+
+from engine import FULL_MASK, has_win
+from solver import Solver
+
+BOOK_SIZE = 3 ** 9
+NO_ENTRY = 0xFF
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'opening_book.bin')
+
+# Вклад каждой 9-битной маски в троичный индекс: X даёт 1, O даёт 2
+X_INDEX = tuple(sum(3 ** i for i in range(9) if mask >> i & 1) for mask in range(1 << 9))
+O_INDEX = tuple(2 * value for value in X_INDEX)
+
+
+def encode(x, o):
+    """Троичный индекс позиции"""
+    return X_INDEX[x] + O_INDEX[o]
+
+
+def decode(index):
+    """Позиция (x, o) по троичному индексу"""
+    x = o = 0
+    for i in range(9):
+        index, digit = divmod(index, 3)
+        if digit == 1:
+            x |= 1 << i
+        elif digit == 2:
+            o |= 1 << i
+    return x, o
+
+
+def pack_entry(move, value):
+    return move | (value + 1) << 4
+
+
+def unpack_entry(byte):
+    if byte == NO_ENTRY:
+        return None
+    return byte & 0x0F, (byte >> 4) - 1
+
+
+def reachable_positions():
+    """Все позиции, достижимые из пустой доски по правилам (включая законченные)"""
+    seen = set()
+    stack = [(0, 0)]
+    while stack:
+        x, o = stack.pop()
+        if (x, o) in seen:
+            continue
+        seen.add((x, o))
+        if has_win(x) or has_win(o) or x | o == FULL_MASK:
+            continue
+        x_turn = x.bit_count() == o.bit_count()
+        free = ~(x | o) & FULL_MASK
+        while free:
+            bit = free & -free
+            free ^= bit
+            stack.append((x | bit, o) if x_turn else (x, o | bit))
+    return seen
+
+
+def build_table(solver=None):
+    """Таблица книги в памяти"""
+    solver = solver or Solver()
+    table = bytearray([NO_ENTRY]) * BOOK_SIZE
+    for x, o in reachable_positions():
+        move, value = solver.solve(x, o)
+        if move is not None:
+            table[encode(x, o)] = pack_entry(move, value)
+    return table
+
+
+def build_book(path=DEFAULT_PATH, solver=None):
+    """Строит книгу и атомарно записывает её в файл"""
+    table = build_table(solver)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(table)
+    os.replace(tmp_path, path)
+    return path
+
+
+class OpeningBook:
+    """Книга, отображённая в память только для чтения
+
+    Несколько процессов, открывших один файл, делят одну копию страниц.
+    """
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        with open(path, 'rb') as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.data) != BOOK_SIZE:
+            self.data.close()
+            raise ValueError(f"Неверный размер книги: {path}")
+
+    def lookup(self, x, o):
+        """(ход, оценка) для игрока, который ходит, или None"""
+        return unpack_entry(self.data[X_INDEX[x] + O_INDEX[o]])
+
+    def best_move(self, board):
+        entry = self.lookup(board.x, board.o)
+        return entry if entry is not None else (None, 0)
+
+    def close(self):
+        self.data.close()
+
+
+def open_book(path=DEFAULT_PATH, build=True):
+    """Открывает книгу, при необходимости собирая её; None, если это невозможно"""
+    try:
+        if build and not os.path.exists(path):
+            build_book(path)
+        return OpeningBook(path)
+    except (OSError, ValueError) as e:
+        print(f"Книга ходов недоступна: {e}")
+        return None
+
+
+if __name__ == '__main__':
+    target = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PATH
+    positions = reachable_positions()
+    build_book(target)
+    print(f"Позиций: {len(positions)}, книга записана в {target}")
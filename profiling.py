@@ -0,0 +1,218 @@
+"""
+Профилирование приложения: гистограммы задержек в духе HDR Histogram
+
+Значения хранятся в микросекундах в логарифмически-линейных корзинах:
+до SUB_BUCKETS мкс - точно, дальше каждая степень двойки делится на
+SUB_BUCKETS / 2 корзин, то есть относительная погрешность не больше 1/32.
+Запись - несколько битовых операций и инкремент счётчика
+
+Профилирование включается переменной окружения TICTACTOE_PROFILE
+(путь к файлу отчёта или 1) или флагом --profile[=путь] в main.py.
+Выключенное, оно не стоит ничего: методы приложения не оборачиваются
+
+Отчёт о запуске (импорт, создание приложения, build, первый кадр)
+печатается при TICTACTOE_STARTUP=1 или флаге --startup
+"""
+
+import functools
+import json
+import os
+import time
+
+ENV_VAR = 'TICTACTOE_PROFILE'
+STARTUP_ENV_VAR = 'TICTACTOE_STARTUP'
+DEFAULT_PATH = 'profile.json'
+
+# Точка отсчёта отчёта о запуске: модуль импортируется первым в main.py
+PROCESS_START = time.perf_counter()
+
+SUB_BITS = 6
+SUB_BUCKETS = 1 << SUB_BITS
+HALF = SUB_BUCKETS // 2
+
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+def bucket_index(value):
+    """Номер корзины для целого значения в микросекундах"""
+    if value < SUB_BUCKETS:
+        return value
+    shift = value.bit_length() - SUB_BITS
+    return SUB_BUCKETS + (shift - 1) * HALF + (value >> shift) - HALF
+
+
+def bucket_bounds(index):
+    """Наименьшее и наибольшее значение, попадающие в корзину"""
+    if index < SUB_BUCKETS:
+        return index, index
+    shift, offset = divmod(index - SUB_BUCKETS, HALF)
+    shift += 1
+    low = (offset + HALF) << shift
+    return low, low + (1 << shift) - 1
+
+
+class Histogram:
+    """Гистограмма задержек в микросекундах"""
+
+    __slots__ = ('counts', 'total', 'sum', 'min', 'max')
+
+    def __init__(self):
+        self.counts = []
+        self.total = 0
+        self.sum = 0
+        self.min = None
+        self.max = 0
+
+    def record(self, seconds):
+        value = max(0, int(seconds * 1_000_000))
+        index = bucket_index(value)
+        counts = self.counts
+        if index >= len(counts):
+            counts.extend([0] * (index + 1 - len(counts)))
+        counts[index] += 1
+        self.total += 1
+        self.sum += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, percent):
+        """Верхняя граница корзины, в которую попадает перцентиль, в мкс"""
+        if not self.total:
+            return 0
+        rank = max(1, -(-self.total * percent // 100))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bucket_bounds(index)[1], self.max)
+        return self.max
+
+    def merge(self, other):
+        if len(other.counts) > len(self.counts):
+            self.counts.extend([0] * (len(other.counts) - len(self.counts)))
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+        self.total += other.total
+        self.sum += other.sum
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        self.max = max(self.max, other.max)
+
+    def to_dict(self):
+        """Сводка в миллисекундах и непустые корзины (верхняя граница в мкс -> число)"""
+        return {
+            'count': self.total,
+            'min_ms': (self.min or 0) / 1000,
+            'mean_ms': self.sum / self.total / 1000 if self.total else 0.0,
+            'max_ms': self.max / 1000,
+            **{f'p{percent:g}_ms': self.percentile(percent) / 1000 for percent in PERCENTILES},
+            'buckets': {
+                bucket_bounds(index)[1]: count for index, count in enumerate(self.counts) if count
+            },
+        }
+
+
+class Profiler:
+    """Набор именованных гистограмм с выгрузкой в JSON"""
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self.histograms = {}
+        # Имя -> наибольшее значение (например, число идущих анимаций)
+        self.gauges = {}
+        self.started = time.time()
+
+    def histogram(self, name):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        return histogram
+
+    def record(self, name, seconds):
+        self.histogram(name).record(seconds)
+
+    def wrap(self, name, func):
+        """Функция, записывающая время каждого вызова func"""
+        histogram = self.histogram(name)
+        clock = time.perf_counter
+
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            started = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                histogram.record(clock() - started)
+        return timed
+
+    def instrument(self, obj, names):
+        """Подменяет методы объекта на замеряющие обёртки (только у этого экземпляра)"""
+        for name in names:
+            setattr(obj, name, self.wrap(name, getattr(obj, name)))
+
+    def gauge(self, name, value):
+        """Замер величины на кадре; в отчёт попадает наибольший"""
+        self.gauges[name] = max(value, self.gauges.get(name, value))
+
+    def frame(self, dt):
+        """Обработчик Clock.schedule_interval: интервал между кадрами"""
+        self.histogram('frame').record(dt)
+
+    def report(self):
+        return {
+            'started': self.started,
+            'duration_s': time.time() - self.started,
+            'histograms': {name: h.to_dict() for name, h in sorted(self.histograms.items())},
+            'gauges': dict(sorted(self.gauges.items())),
+        }
+
+    def dump(self, path=None):
+        """Пишет отчёт в файл (атомарно) и возвращает путь"""
+        path = path or self.path
+        tmp = path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, ensure_ascii=False, indent=2)
+        os.replace(tmp, path)
+        return path
+
+
+def profiler_from_env(environ=os.environ):
+    """Profiler, если профилирование включено, иначе None"""
+    value = environ.get(ENV_VAR, '')
+    if value in ('', '0'):
+        return None
+    return Profiler(DEFAULT_PATH if value == '1' else value)
+
+
+class StartupReport:
+    """Отметки времени этапов запуска от PROCESS_START"""
+
+    def __init__(self, origin=None):
+        self.origin = PROCESS_START if origin is None else origin
+        self.marks = []
+
+    def mark(self, name, when=None):
+        self.marks.append((name, time.perf_counter() if when is None else when))
+
+    def durations(self):
+        """(этап, длительность этапа в секундах) по порядку"""
+        previous = self.origin
+        result = []
+        for name, when in self.marks:
+            result.append((name, when - previous))
+            previous = when
+        return result
+
+    def format(self):
+        total = self.marks[-1][1] - self.origin if self.marks else 0.0
+        stages = ', '.join(f"{name} {seconds * 1000:.0f} мс" for name, seconds in self.durations())
+        return f"Запуск: {stages}; всего {total * 1000:.0f} мс"
+
+
+def startup_report_from_env(environ=os.environ):
+    """StartupReport, если включён отчёт о запуске, иначе None"""
+    if environ.get(STARTUP_ENV_VAR, '') in ('', '0'):
+        return None
+    return StartupReport()
@@ -0,0 +1,299 @@
+"""
+Журнал сыгранных партий в компактном двоичном формате
+
+Запись партии:
+  байт 0 - итог (биты 0-1: 0 не окончена, 1 X, 2 O, 3 ничья),
+           бит 2 - поле 3x3; иначе следом три байта rows, cols, k
+  ходы   - на 3x3 по 4 бита (два хода в байте, 0xF - заполнитель),
+           на поле до 256 клеток по байту, на больших - по два байта
+
+Журнал - файл, куда записи только дописываются, каждая с длиной
+в формате varint. Рядом лежит индекс (.idx): смещение каждой записи
+восьмибайтовым числом, по нему партия читается по номеру через mmap
+
+Запуск: python records.py журнал [номер партии]
+"""
+
+import mmap
+import os
+import struct
+import sys
+from collections import namedtuple
+
+from mnk import make_board
+
+RESULT_CODES = {None: 0, 'X': 1, 'O': 2, 'draw': 3}
+RESULTS = {code: result for result, code in RESULT_CODES.items()}
+
+STANDARD_FLAG = 0b100
+NIBBLE_PAD = 0xF
+
+OFFSET = struct.Struct('<Q')
+BUFFER_SIZE = 64 * 1024
+
+GameRecord = namedtuple('GameRecord', 'rows cols k moves result')
+
+
+def record_from_board(board):
+    """Запись партии по доске с историей ходов"""
+    winner = board.winner()
+    if winner is None and board.is_full():
+        winner = 'draw'
+    return GameRecord(board.rows, board.cols, board.k, tuple(board.history), winner)
+
+
+def replay(record):
+    """Доска после всех ходов записи"""
+    board = make_board(record.rows, record.cols, record.k)
+    for position in record.moves:
+        board.make_move(position)
+    return board
+
+
+# ========== ЗАПИСЬ В БАЙТЫ ==========
+
+def encode_record(record):
+    moves = record.moves
+    header = RESULT_CODES[record.result]
+    if (record.rows, record.cols, record.k) == (3, 3, 3):
+        data = bytearray([header | STANDARD_FLAG])
+        padded = list(moves) + [NIBBLE_PAD] * (len(moves) % 2)
+        data.extend(padded[i] | padded[i + 1] << 4 for i in range(0, len(padded), 2))
+        return bytes(data)
+
+    data = bytearray([header, record.rows, record.cols, record.k])
+    if record.rows * record.cols <= 256:
+        data.extend(moves)
+    else:
+        for position in moves:
+            data.extend(position.to_bytes(2, 'big'))
+    return bytes(data)
+
+
+def decode_record(data):
+    header = data[0]
+    result = RESULTS[header & 0b11]
+    if header & STANDARD_FLAG:
+        moves = []
+        for byte in data[1:]:
+            moves.append(byte & 0xF)
+            if byte >> 4 != NIBBLE_PAD:
+                moves.append(byte >> 4)
+        return GameRecord(3, 3, 3, tuple(moves), result)
+
+    rows, cols, k = data[1], data[2], data[3]
+    body = data[4:]
+    if rows * cols <= 256:
+        moves = tuple(body)
+    else:
+        moves = tuple(int.from_bytes(body[i:i + 2], 'big') for i in range(0, len(body), 2))
+    return GameRecord(rows, cols, k, moves, result)
+
+
+def encode_varint(value):
+    data = bytearray()
+    while value >= 0x80:
+        data.append(value & 0x7F | 0x80)
+        value >>= 7
+    data.append(value)
+    return bytes(data)
+
+
+def read_varint(read):
+    """Varint через функцию чтения одного байта; None в конце данных"""
+    value = shift = 0
+    while True:
+        byte = read(1)
+        if not byte:
+            return None
+        value |= (byte[0] & 0x7F) << shift
+        if byte[0] < 0x80:
+            return value
+        shift += 7
+
+
+def varint_at(data, offset):
+    """(значение, смещение после него) для varint в буфере"""
+    value = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+# ========== ЖУРНАЛ ==========
+
+def index_path(path):
+    return path + '.idx'
+
+
+def scan_log(path):
+    """Смещения целых записей журнала и конец последней из них"""
+    offsets = []
+    end = 0
+    with open(path, 'rb', buffering=BUFFER_SIZE) as f:
+        while True:
+            length = read_varint(f.read)
+            if length is None or len(f.read(length)) < length:
+                break
+            offsets.append(end)
+            end = f.tell()
+    return offsets, end
+
+
+def rebuild_index(path):
+    """Заново строит индекс; обрывок записи в конце журнала отрезается"""
+    offsets, end = scan_log(path)
+    if os.path.getsize(path) != end:
+        os.truncate(path, end)
+    tmp = index_path(path) + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(b''.join(OFFSET.pack(offset) for offset in offsets))
+    os.replace(tmp, index_path(path))
+    return len(offsets)
+
+
+def index_is_valid(path):
+    """Индекс указывает на все записи журнала и только на них"""
+    try:
+        size = os.path.getsize(index_path(path))
+    except OSError:
+        return False
+    log_size = os.path.getsize(path)
+    if size % OFFSET.size:
+        return False
+    if size == 0:
+        return log_size == 0
+    with open(index_path(path), 'rb') as f:
+        f.seek(size - OFFSET.size)
+        last = OFFSET.unpack(f.read(OFFSET.size))[0]
+    with open(path, 'rb') as f:
+        f.seek(last)
+        length = read_varint(f.read)
+        return length is not None and f.tell() + length == log_size
+
+
+class GameLog:
+    """Журнал, открытый на дописывание; записи и индекс буферизуются
+
+    Смещения копятся в памяти и попадают в индекс только в flush, после
+    сброса журнала: иначе индекс (8 байт на партию против ~4 байт записи
+    3x3) заполнял бы свой буфер первым и ссылался на недописанные записи.
+    """
+
+    def __init__(self, path, buffer_size=BUFFER_SIZE):
+        self.path = path
+        if not os.path.exists(path):
+            open(path, 'wb').close()
+        if index_is_valid(path):
+            self.count = os.path.getsize(index_path(path)) // OFFSET.size
+        else:
+            self.count = rebuild_index(path)
+        self.buffer_size = buffer_size
+        self.log = open(path, 'ab', buffering=buffer_size)
+        self.index = open(index_path(path), 'ab', buffering=0)
+        self.pending = bytearray()
+        self.offset = self.log.tell()
+
+    def append(self, record):
+        """Дописывает партию, возвращает её номер"""
+        data = encode_record(record)
+        frame = encode_varint(len(data)) + data
+        self.log.write(frame)
+        self.pending += OFFSET.pack(self.offset)
+        self.offset += len(frame)
+        self.count += 1
+        if len(self.pending) >= self.buffer_size:
+            self.flush()
+        return self.count - 1
+
+    def append_board(self, board):
+        return self.append(record_from_board(board))
+
+    def flush(self):
+        # Сначала журнал: индекс не должен ссылаться на недописанные записи
+        self.log.flush()
+        self.index.write(self.pending)
+        self.pending.clear()
+
+    def close(self):
+        self.flush()
+        self.log.close()
+        self.index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_records(path, buffer_size=BUFFER_SIZE):
+    """Генератор записей журнала; файл читается потоком, обрывок в конце пропускается"""
+    with open(path, 'rb', buffering=buffer_size) as f:
+        while True:
+            length = read_varint(f.read)
+            if length is None:
+                return
+            data = f.read(length)
+            if len(data) < length:
+                return
+            yield decode_record(data)
+
+
+class GameIndex:
+    """Чтение партий по номеру через mmap журнала и индекса"""
+
+    def __init__(self, path):
+        self.log = map_file(path)
+        if index_is_valid(path):
+            self.offsets = map_file(index_path(path))
+        else:
+            # Читатель не трогает файлы: журнал мог открыть на запись другой процесс
+            self.offsets = b''.join(OFFSET.pack(offset) for offset in scan_log(path)[0])
+
+    def __len__(self):
+        return len(self.offsets) // OFFSET.size
+
+    def __getitem__(self, number):
+        if number < 0:
+            number += len(self)
+        if not 0 <= number < len(self):
+            raise IndexError(f"Нет партии с номером {number}")
+        offset = OFFSET.unpack_from(self.offsets, number * OFFSET.size)[0]
+        length, start = varint_at(self.log, offset)
+        if start + length > len(self.log):
+            raise IndexError(f"Партия {number} ещё не записана")
+        return decode_record(self.log[start:start + length])
+
+    def close(self):
+        for data in (self.log, self.offsets):
+            if isinstance(data, mmap.mmap):
+                data.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def map_file(path):
+    """Файл, отображённый только для чтения; пустой файл mmap не отображает"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b''
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+if __name__ == '__main__':
+    log_path = sys.argv[1]
+    if len(sys.argv) > 2:
+        with GameIndex(log_path) as games:
+            print(games[int(sys.argv[2])])
+    else:
+        total = sum(1 for _ in read_records(log_path))
+        print(f"Партий в журнале: {total}, байт: {os.path.getsize(log_path)}")
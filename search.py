@@ -0,0 +1,285 @@
+"""
+Поиск хода с ограничением по времени для досок любого размера
+Итеративное углубление + альфа-бета; возвращает лучший ход последней
+завершённой глубины и прерывается по бюджету или токену отмены.
+Если не успела даже первая глубина - ход с лучшей статической оценкой
+"""
+
+import functools
+import time
+from collections import namedtuple
+
+from mnk import CODES, DIRECTIONS, EMPTY, X
+
+WIN_SCORE = 1_000_000
+
+SearchResult = namedtuple('SearchResult', 'move score depth nodes elapsed')
+
+
+class SearchCancelled(Exception):
+    """Поиск прерван по времени или токену отмены"""
+
+
+class CancelToken:
+    """Флаг отмены, который можно взвести из другого потока"""
+
+    __slots__ = ('cancelled',)
+
+    def __init__(self):
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+def candidate_moves(board, radius=1):
+    """Свободные клетки рядом с уже занятыми; на пустом поле - центр
+
+    На больших полях ходы вдали от фигур почти никогда не нужны,
+    а без этого фильтра ветвление равно числу клеток.
+    """
+    if board.size <= 9:
+        return board.legal_moves()
+    history = board.history
+    if not history:
+        return [board.center]
+    rows, cols = board.rows, board.cols
+    seen = set()
+    moves = []
+    for position in history:
+        row, col = divmod(position, cols)
+        for r in range(max(0, row - radius), min(rows, row + radius + 1)):
+            for c in range(max(0, col - radius), min(cols, col + radius + 1)):
+                cell = r * cols + c
+                if cell not in seen:
+                    seen.add(cell)
+                    if board.is_empty(cell):
+                        moves.append(cell)
+    return moves
+
+
+def board_codes(board):
+    """Клетки кодами EMPTY/X/O; у доски m,n,k - её собственный массив, без копии"""
+    grid = getattr(board, 'grid', None)
+    if grid is not None:
+        return grid
+    return [CODES[cell] for cell in board.cells()]
+
+
+@functools.lru_cache(maxsize=None)
+def board_lines(rows, cols):
+    """Все линии поля по четырём направлениям и номера линий через каждую клетку"""
+    lines = []
+    through = [[] for _ in range(rows * cols)]
+    for dr, dc in DIRECTIONS:
+        for start in range(rows * cols):
+            row, col = divmod(start, cols)
+            if 0 <= row - dr < rows and 0 <= col - dc < cols:
+                # Не начало линии
+                continue
+            line = []
+            while 0 <= row < rows and 0 <= col < cols:
+                through[row * cols + col].append(len(lines))
+                line.append(row * cols + col)
+                row += dr
+                col += dc
+            lines.append(tuple(line))
+    return tuple(lines), tuple(tuple(ids) for ids in through)
+
+
+def line_value(cells, line, k):
+    """Оценка одной линии за X по открытым сериям фигур"""
+    value = 0
+    i, n = 0, len(line)
+    while i < n:
+        code = cells[line[i]]
+        if code == EMPTY:
+            i += 1
+            continue
+        j = i + 1
+        while j < n and cells[line[j]] == code:
+            j += 1
+        open_ends = (i > 0 and cells[line[i - 1]] == EMPTY) + (j < n and cells[line[j]] == EMPTY)
+        if open_ends:
+            score = 10 ** min(j - i, k) * open_ends
+            value += score if code == X else -score
+        i = j
+    return value
+
+
+def evaluate(board, player):
+    """Оценка позиции для player по открытым сериям фигур"""
+    cells = board_codes(board)
+    lines, _ = board_lines(board.rows, board.cols)
+    value = sum(line_value(cells, line, board.k) for line in lines)
+    return value if player == 'X' else -value
+
+
+def move_score(cells, position, code, rows, cols, k):
+    """Сила линий code через пустую клетку position, если поставить туда фигуру
+
+    WIN_SCORE - ход собирает линию. Считается по месту, без хода на доске.
+    """
+    row, col = divmod(position, cols)
+    total = 0
+    for dr, dc in DIRECTIONS:
+        length = 1
+        open_ends = 0
+        for sign in (1, -1):
+            r, c = row + dr * sign, col + dc * sign
+            while 0 <= r < rows and 0 <= c < cols and cells[r * cols + c] == code:
+                length += 1
+                r += dr * sign
+                c += dc * sign
+            if 0 <= r < rows and 0 <= c < cols and cells[r * cols + c] == EMPTY:
+                open_ends += 1
+        if length >= k:
+            return WIN_SCORE
+        total += 10 ** length * open_ends
+    return total
+
+
+class Searcher:
+    """Альфа-бета с итеративным углублением и упорядочиванием ходов"""
+
+    def __init__(self, budget=0.05, token=None, max_depth=None):
+        self.budget = budget
+        self.token = token
+        self.max_depth = max_depth
+        self.nodes = 0
+        self.deadline = None
+        # Оценки линий за X и их сумма; ход пересчитывает только четыре линии через клетку
+        self.lines = self.through = ()
+        self.line_scores = []
+        self.total = 0
+        self.saved = []
+        # Лучшие ходы прошлых итераций для упорядочивания
+        self.best_moves = {}
+
+    def check(self):
+        # Узел стоит десятки микросекунд и больше - часы проверяются в каждом
+        if self.token is not None and self.token.cancelled:
+            raise SearchCancelled()
+        if time.perf_counter() > self.deadline:
+            raise SearchCancelled()
+
+    def play(self, board, move, player):
+        board.make_move(move, player)
+        cells = board_codes(board)
+        scores = self.line_scores
+        saved = []
+        for line_id in self.through[move]:
+            value = line_value(cells, self.lines[line_id], board.k)
+            saved.append((line_id, scores[line_id]))
+            self.total += value - scores[line_id]
+            scores[line_id] = value
+        self.saved.append(saved)
+
+    def unplay(self, board):
+        board.undo()
+        scores = self.line_scores
+        for line_id, value in self.saved.pop():
+            self.total += value - scores[line_id]
+            scores[line_id] = value
+
+    def ordered_moves(self, board, player, opponent):
+        """Кандидаты по статической оценке за один проход
+
+        Свой выигрыш (2 * WIN_SCORE) идёт раньше блока (WIN_SCORE и больше),
+        блок - раньше лучшего хода прошлой итерации, тот - раньше остальных.
+        """
+        moves = candidate_moves(board)
+        cells = board_codes(board)
+        mine, theirs = CODES[player], CODES[opponent]
+        rows, cols, k = board.rows, board.cols, board.k
+        previous = self.best_moves.get(tuple(board.history))
+        scores = {}
+        for move in moves:
+            score = (2 * move_score(cells, move, mine, rows, cols, k) +
+                     move_score(cells, move, theirs, rows, cols, k))
+            if move == previous:
+                score += WIN_SCORE // 2
+            scores[move] = score
+        return sorted(moves, key=scores.__getitem__, reverse=True)
+
+    def negamax(self, board, depth, alpha, beta, player, opponent, ply):
+        self.nodes += 1
+        self.check()
+
+        if board.winner() is not None:
+            # Последний ход сделал соперник
+            return -(WIN_SCORE - ply)
+        if board.is_full():
+            return 0
+        if depth == 0:
+            return self.total if player == 'X' else -self.total
+
+        best_score = -WIN_SCORE - 1
+        best_move = None
+        for move in self.ordered_moves(board, player, opponent):
+            self.play(board, move, player)
+            try:
+                score = -self.negamax(board, depth - 1, -beta, -alpha, opponent, player, ply + 1)
+            finally:
+                self.unplay(board)
+            if score > best_score:
+                best_score = score
+                best_move = move
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                break
+        self.best_moves[tuple(board.history)] = best_move
+        return best_score
+
+    def root(self, board, depth, player, opponent):
+        alpha, beta = -WIN_SCORE - 1, WIN_SCORE + 1
+        best_move, best_score = None, alpha
+        for move in self.ordered_moves(board, player, opponent):
+            self.play(board, move, player)
+            try:
+                score = -self.negamax(board, depth - 1, -beta, -alpha, opponent, player, 1)
+            finally:
+                self.unplay(board)
+            if score > best_score:
+                best_score = score
+                best_move = move
+            alpha = max(alpha, score)
+        self.best_moves[tuple(board.history)] = best_move
+        return best_move, best_score
+
+    def search(self, board):
+        """Лучший найденный ход за отведённое время"""
+        started = time.perf_counter()
+        self.deadline = started + self.budget
+        player = board.current_player
+        opponent = 'O' if player == 'X' else 'X'
+        self.lines, self.through = board_lines(board.rows, board.cols)
+        cells = board_codes(board)
+        self.line_scores = [line_value(cells, line, board.k) for line in self.lines]
+        self.total = sum(self.line_scores)
+
+        moves = self.ordered_moves(board, player, opponent)
+        if not moves or board.winner() is not None:
+            return SearchResult(None, 0, 0, 0, 0.0)
+        # Глубина 0: лучший ход по статической оценке, если первая глубина не успеет
+        result = SearchResult(moves[0], 0, 0, 0, 0.0)
+
+        max_depth = self.max_depth or board.size - board.move_count
+        for depth in range(1, max_depth + 1):
+            if self.token is not None and self.token.cancelled:
+                break
+            try:
+                move, score = self.root(board, depth, player, opponent)
+            except SearchCancelled:
+                break
+            result = SearchResult(move, score, depth, self.nodes, time.perf_counter() - started)
+            # Найден форсированный результат - глубже искать незачем
+            if abs(score) >= WIN_SCORE - board.size:
+                break
+        return result._replace(nodes=self.nodes, elapsed=time.perf_counter() - started)
+
+
+def search_move(board, budget=0.05, token=None, max_depth=None):
+    """Лучший ход для игрока, который ходит, не дольше budget секунд"""
+    return Searcher(budget, token, max_depth).search(board)
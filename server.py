@@ -0,0 +1,282 @@
+"""
+Игровой сервер на asyncio: много партий по TCP на localhost
+Протокол - JSON по одной строке на сообщение:
+
+  {"op": "create", "mode": "ai" | "friend", "size": [rows, cols, k]}
+  {"op": "join", "session": id}
+  {"op": "spectate", "session": id}
+  {"op": "move", "session": id, "position": n}
+  {"op": "state", "session": id}
+
+Ответ на запрос содержит "ok"; остальным участникам партии
+рассылается {"event": "state", ...}. Ходы проверяются движком на сервере,
+ходы ИИ считаются в пуле потоков, законченные партии пишутся в журнал.
+Позиции партий 3x3 хранятся словами в общей SessionArena
+
+Запуск: python server.py [порт] [журнал партий]
+"""
+
+import asyncio
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from arena import SessionArena
+from game import choose_ai_move
+from mnk import make_board
+
+SYMBOLS = {'': '.', 'X': 'X', 'O': 'O'}
+
+# Предел длины строки запроса
+MAX_LINE = 4096
+
+# Очередь входящих соединений: тысячи клиентов подключаются одновременно
+BACKLOG = 4096
+
+
+class ProtocolError(Exception):
+    """Ошибка в запросе клиента; текст уходит клиенту"""
+
+
+class Session:
+    """Одна партия на сервере
+
+    Позиция 3x3 живёт в слоте арены, board читает её как BitBoard,
+    а save записывает ход обратно. Доски других размеров хранятся объектом.
+    """
+
+    __slots__ = ('id', 'mode', 'arena', 'slot', 'own_board', 'players', 'spectators', 'ai_busy')
+
+    def __init__(self, session_id, mode, rows=3, cols=3, k=3, arena=None):
+        self.id = session_id
+        self.mode = mode
+        self.arena = arena
+        self.slot = self.own_board = None
+        if arena is not None and (rows, cols, k) == (3, 3, 3):
+            self.slot = arena.create(mode)
+        else:
+            self.own_board = make_board(rows, cols, k)
+        # Символ игрока -> соединение
+        self.players = {}
+        self.spectators = set()
+        self.ai_busy = False
+
+    @property
+    def board(self):
+        if self.slot is None:
+            return self.own_board
+        return self.arena.board(self.slot)
+
+    def save(self, board):
+        """Записывает изменённую доску из board в арену"""
+        if self.slot is not None:
+            self.arena.store(self.slot, board)
+
+    def close(self):
+        """Освобождает слот арены"""
+        if self.slot is not None:
+            self.arena.release(self.slot)
+            self.slot = None
+
+    @property
+    def winner(self):
+        return self.board.winner()
+
+    @property
+    def over(self):
+        board = self.board
+        return board.winner() is not None or board.is_full()
+
+    def state(self):
+        board = self.board
+        return {
+            'session': self.id,
+            'size': [board.rows, board.cols, board.k],
+            'cells': ''.join(SYMBOLS[cell] for cell in board.cells()),
+            'turn': board.current_player,
+            'winner': board.winner(),
+            'over': board.winner() is not None or board.is_full(),
+        }
+
+    def connections(self):
+        return list(self.players.values()) + list(self.spectators)
+
+
+class Connection:
+    __slots__ = ('writer', 'sessions')
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.sessions = set()
+
+    def send(self, message):
+        if not self.writer.is_closing():
+            self.writer.write(json.dumps(message, ensure_ascii=False).encode() + b'\n')
+
+
+class GameServer:
+    def __init__(self, book=None, executor=None, log=None):
+        self.book = book
+        # GameLog для законченных партий или None
+        self.log = log
+        self.executor = executor or ThreadPoolExecutor(thread_name_prefix='ai')
+        self.sessions = {}
+        self.arena = SessionArena()
+        self.next_id = 1
+        self.server = None
+
+    async def start(self, host='127.0.0.1', port=0):
+        self.server = await asyncio.start_server(self.handle, host, port, limit=MAX_LINE, backlog=BACKLOG)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        self.executor.shutdown(wait=False)
+
+    async def handle(self, reader, writer):
+        connection = Connection(writer)
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, ConnectionError):
+                    break
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ProtocolError("Ожидался JSON-объект")
+                    response = await self.dispatch(connection, request)
+                    response['ok'] = True
+                except ProtocolError as e:
+                    response = {'ok': False, 'error': str(e)}
+                except ValueError:
+                    response = {'ok': False, 'error': "Неверный JSON"}
+                connection.send(response)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.disconnect(connection)
+            writer.close()
+
+    def disconnect(self, connection):
+        for session_id in connection.sessions:
+            session = self.sessions.get(session_id)
+            if session is None:
+                continue
+            session.spectators.discard(connection)
+            for symbol, player in list(session.players.items()):
+                if player is connection:
+                    del session.players[symbol]
+            if not session.players:
+                del self.sessions[session_id]
+                session.close()
+
+    def get_session(self, request):
+        session = self.sessions.get(request.get('session'))
+        if session is None:
+            raise ProtocolError("Партия не найдена")
+        return session
+
+    async def dispatch(self, connection, request):
+        op = request.get('op')
+        if op == 'create':
+            return self.op_create(connection, request)
+        if op == 'join':
+            return self.op_join(connection, request)
+        if op == 'spectate':
+            session = self.get_session(request)
+            session.spectators.add(connection)
+            connection.sessions.add(session.id)
+            return session.state()
+        if op == 'state':
+            return self.get_session(request).state()
+        if op == 'move':
+            return await self.op_move(connection, request)
+        raise ProtocolError(f"Неизвестная операция: {op}")
+
+    def op_create(self, connection, request):
+        mode = request.get('mode', 'ai')
+        if mode not in ('ai', 'friend'):
+            raise ProtocolError("Режим должен быть ai или friend")
+        size = request.get('size', [3, 3, 3])
+        try:
+            rows, cols, k = (int(value) for value in size)
+            if not (1 <= rows <= 32 and 1 <= cols <= 32):
+                raise ValueError
+            session = Session(self.next_id, mode, rows, cols, k, self.arena)
+        except (TypeError, ValueError):
+            raise ProtocolError("Неверный размер поля") from None
+        self.next_id += 1
+        self.sessions[session.id] = session
+        session.players['X'] = connection
+        connection.sessions.add(session.id)
+        return dict(session.state(), player='X')
+
+    def op_join(self, connection, request):
+        session = self.get_session(request)
+        if session.mode != 'friend' or 'O' in session.players:
+            raise ProtocolError("Место в партии занято")
+        session.players['O'] = connection
+        connection.sessions.add(session.id)
+        self.broadcast(session, connection)
+        return dict(session.state(), player='O')
+
+    async def op_move(self, connection, request):
+        session = self.get_session(request)
+        board = session.board
+        if session.over:
+            raise ProtocolError("Игра завершена")
+        if session.ai_busy or session.players.get(board.current_player) is not connection:
+            raise ProtocolError("Сейчас не ваш ход")
+        position = request.get('position')
+        if not isinstance(position, int) or not board.make_move(position):
+            raise ProtocolError("Неверный ход")
+        # Пока ИИ считает, состояние партии уже показывает ход игрока
+        session.save(board)
+
+        if session.mode == 'ai' and not session.over:
+            session.ai_busy = True
+            try:
+                loop = asyncio.get_running_loop()
+                move = await loop.run_in_executor(self.executor, choose_ai_move, board.copy(), self.book)
+            finally:
+                session.ai_busy = False
+            board.make_move(move)
+            session.save(board)
+
+        if self.log is not None and session.over:
+            self.log.append_board(board)
+        self.broadcast(session, connection)
+        return session.state()
+
+    def broadcast(self, session, sender):
+        if not session.spectators and len(session.players) < 2:
+            return
+        message = dict(session.state(), event='state')
+        for connection in session.connections():
+            if connection is not sender:
+                connection.send(message)
+
+
+async def serve(port=8765, book=None, log=None):
+    server = GameServer(book, log=log)
+    port = await server.start(port=port)
+    print(f"Сервер слушает 127.0.0.1:{port}")
+    async with server.server:
+        await server.server.serve_forever()
+
+
+if __name__ == '__main__':
+    from opening_book import open_book
+    from records import GameLog
+    game_log = GameLog(sys.argv[2]) if len(sys.argv) > 2 else None
+    try:
+        asyncio.run(serve(int(sys.argv[1]) if len(sys.argv) > 1 else 8765, open_book(), game_log))
+    finally:
+        if game_log is not None:
+            game_log.close()
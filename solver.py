@@ -0,0 +1,112 @@
+"""
+Точный решатель крестиков-ноликов: негамакс с альфа-бета отсечением
+Таблица транспозиций живёт на уровне модуля и остаётся прогретой между партиями;
+симметричные позиции делят в ней одну запись
+"""
+
+from engine import FULL_MASK, has_win
+from symmetry import SymmetricCache
+
+# Порядок перебора: центр, углы, стороны
+MOVE_ORDER = (4, 0, 2, 6, 8, 1, 3, 5, 7)
+
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# Максимальная оценка: победа на первом ходу
+WIN_SCORE = 10
+
+
+class Solver:
+    """Негамакс с таблицей транспозиций
+
+    Оценка считается для игрока, который ходит: победа быстрее даёт
+    большую оценку, поражение позже - меньший проигрыш, ничья 0.
+    """
+
+    def __init__(self):
+        # Симметричные позиции делят запись: (ход, (флаг, оценка))
+        self.table = SymmetricCache()
+        self.nodes = 0
+
+    def clear(self):
+        self.table.clear()
+
+    def negamax(self, own, other, alpha=-WIN_SCORE, beta=WIN_SCORE):
+        """Оценка позиции для игрока own, которому принадлежит ход"""
+        self.nodes += 1
+        occupied = own | other
+        # Соперник только что сходил - проверяем только его
+        if has_win(other):
+            return occupied.bit_count() - WIN_SCORE
+        if occupied == FULL_MASK:
+            return 0
+
+        entry = self.table.get(own, other)
+        tt_move = None
+        if entry is not None:
+            tt_move, (flag, score) = entry
+            if flag == EXACT:
+                return score
+            if flag == LOWER and score >= beta:
+                return score
+            if flag == UPPER and score <= alpha:
+                return score
+
+        alpha_orig = alpha
+        best_score = -WIN_SCORE - 1
+        best_move = None
+        for move in self.ordered_moves(own, other, tt_move):
+            score = -self.negamax(other, own | 1 << move, -beta, -alpha)
+            if score > best_score:
+                best_score = score
+                best_move = move
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                break
+
+        if best_score <= alpha_orig:
+            flag = UPPER
+        elif best_score >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.table.put(own, other, best_move, (flag, best_score))
+        return best_score
+
+    @staticmethod
+    def ordered_moves(own, other, tt_move):
+        occupied = own | other
+        moves = [m for m in MOVE_ORDER if not occupied >> m & 1]
+        # Лучший ход из таблицы проверяем первым
+        if tt_move in moves:
+            moves.remove(tt_move)
+            moves.insert(0, tt_move)
+        return moves
+
+    def solve(self, x, o):
+        """Лучший ход и теоретическая оценка (1, 0, -1) для игрока, который ходит"""
+        own, other = (x, o) if x.bit_count() == o.bit_count() else (o, x)
+        if has_win(x) or has_win(o) or (x | o) == FULL_MASK:
+            return None, 0
+
+        score = self.negamax(own, other)
+        entry = self.table.get(own, other)
+        if entry is None or entry[1][0] != EXACT:
+            # Полное окно корня даёт точную оценку, но в таблице могла остаться граница
+            self.table.discard(own, other)
+            score = self.negamax(own, other)
+            entry = self.table.get(own, other)
+        return entry[0], (score > 0) - (score < 0)
+
+    def best_move(self, board):
+        """Лучший ход и оценка для позиции BitBoard"""
+        return self.solve(board.x, board.o)
+
+
+_solver = Solver()
+
+
+def best_move(board):
+    """Лучший ход через общий для процесса решатель"""
+    return _solver.best_move(board)
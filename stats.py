@@ -0,0 +1,169 @@
+"""
+Постоянная статистика партий в SQLite (режим WAL)
+Итоги хранятся по режиму игры и размеру поля, плюс история всех партий.
+
+Все обращения к базе идут в отдельном потоке: record() только кладёт
+итог в очередь, а поток пишет накопившиеся партии одной транзакцией
+не чаще раза в delay секунд. Итоги читаются по запросу, результат
+возвращается через post (в приложении - Clock.schedule_once)
+
+Запуск: python stats.py [путь к базе]
+"""
+
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+
+from ai_worker import call_now
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'stats.db')
+
+# Пауза, за которую итоги партий собираются в одну запись
+WRITE_DELAY = 1.0
+
+RESULTS = ('X', 'O', 'draw')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    mode TEXT NOT NULL,
+    board TEXT NOT NULL,
+    result TEXT NOT NULL,
+    played REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS totals (
+    mode TEXT NOT NULL,
+    board TEXT NOT NULL,
+    x INTEGER NOT NULL DEFAULT 0,
+    o INTEGER NOT NULL DEFAULT 0,
+    draws INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (mode, board)
+);
+"""
+
+UPSERT = """
+INSERT INTO totals (mode, board, x, o, draws) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (mode, board) DO UPDATE SET
+    x = x + excluded.x, o = o + excluded.o, draws = draws + excluded.draws
+"""
+
+_STOP = object()
+
+
+def empty_totals():
+    return {result: 0 for result in RESULTS}
+
+
+def connect(path):
+    connection = sqlite3.connect(path)
+    connection.execute('PRAGMA journal_mode=WAL')
+    connection.execute('PRAGMA synchronous=NORMAL')
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def write_games(connection, games):
+    """Пишет пачку (mode, board, result, played) одной транзакцией"""
+    counts = {}
+    for mode, board, result, _ in games:
+        totals = counts.setdefault((mode, board), empty_totals())
+        totals[result] += 1
+    with connection:
+        connection.executemany('INSERT INTO games (mode, board, result, played) VALUES (?, ?, ?, ?)', games)
+        connection.executemany(UPSERT, [
+            (mode, board, totals['X'], totals['O'], totals['draw'])
+            for (mode, board), totals in counts.items()
+        ])
+
+
+def read_totals(connection, mode, board):
+    if connection is None:
+        return empty_totals()
+    row = connection.execute(
+        'SELECT x, o, draws FROM totals WHERE mode = ? AND board = ?', (mode, board)
+    ).fetchone()
+    return dict(zip(RESULTS, row)) if row else empty_totals()
+
+
+class StatsStore:
+    """Статистика партий с записью пачками в фоновом потоке"""
+
+    def __init__(self, path=DEFAULT_PATH, delay=WRITE_DELAY, post=call_now):
+        self.path = path
+        self.delay = delay
+        self.post = post
+        self.queue = queue.Queue()
+        self.batches = 0
+        self.thread = threading.Thread(target=self.run, name='stats', daemon=True)
+        self.thread.start()
+
+    def record(self, mode, board, result):
+        """Итог партии: 'X', 'O' или 'draw'; вызов не ждёт базу"""
+        if result not in RESULTS:
+            raise ValueError(f"Неизвестный итог партии: {result}")
+        self.queue.put((mode, board, result, time.time()))
+
+    def totals(self, mode, board, callback):
+        """Запрашивает итоги; callback(dict) вызывается через post"""
+        def query(connection):
+            result = read_totals(connection, mode, board)
+            self.post(lambda: callback(result))
+        self.queue.put(query)
+
+    def flush(self):
+        """Дожидается записи всего, что уже передано в record()"""
+        done = threading.Event()
+        self.queue.put(lambda connection: done.set())
+        done.wait()
+
+    def close(self):
+        if self.thread.is_alive():
+            self.queue.put(_STOP)
+            self.thread.join()
+
+    def run(self):
+        try:
+            connection = connect(self.path)
+        except sqlite3.Error as e:
+            # Без базы игра продолжается: итоги отбрасываются, запросы получают нули
+            print(f"Статистика недоступна: {e}")
+            connection = None
+        pending = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            if isinstance(item, tuple):
+                # Пачка пишется через delay после первой партии в ней
+                if not pending:
+                    deadline = time.monotonic() + self.delay
+                pending.append(item)
+                continue
+            try:
+                # Срок вышел, пришёл запрос или остановка: сначала пишем накопленное
+                if pending and connection is not None:
+                    write_games(connection, pending)
+                    self.batches += 1
+                if item is not None and item is not _STOP:
+                    item(connection)
+            except sqlite3.Error as e:
+                print(f"Ошибка записи статистики: {e}")
+            pending = []
+            deadline = None
+            if item is _STOP:
+                break
+        if connection is not None:
+            connection.close()
+
+
+if __name__ == '__main__':
+    connection = connect(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PATH)
+    for mode, board, x, o, draws in connection.execute('SELECT * FROM totals ORDER BY mode, board'):
+        print(f"{mode:7} {board:8} X: {x}  O: {o}  ничьи: {draws}")
+    connection.close()
@@ -0,0 +1,62 @@
+"""
+Реестр стратегий ИИ для турниров и пакетных прогонов
+Стратегия - функция (board, rng) -> номер клетки; регистрируется по имени,
+чтобы её можно было передать в другой процесс
+"""
+
+from engine import BitBoard
+from game import heuristic_move, simple_move
+from mcts import mcts_move
+from search import search_move
+from solver import best_move
+
+STRATEGIES = {}
+
+
+def register(name):
+    def decorator(func):
+        STRATEGIES[name] = func
+        return func
+    return decorator
+
+
+def get_strategy(name):
+    try:
+        return STRATEGIES[name]
+    except KeyError:
+        raise ValueError(f"Неизвестная стратегия: {name}") from None
+
+
+@register('random')
+def random_move(board, rng):
+    return rng.choice(board.legal_moves())
+
+
+@register('simple')
+def simple_strategy(board, rng=None):
+    """SimpleAI: центр, углы, первая свободная"""
+    return simple_move(board)
+
+
+@register('heuristic')
+def heuristic_strategy(board, rng):
+    """Эвристика приложения: выигрыш, блок, центр, случайный угол, случайный ход"""
+    return heuristic_move(board, rng)
+
+
+@register('solver')
+def solver_move(board, rng=None):
+    """Точный решатель на 3x3; на больших полях, как в приложении, - поиск по времени"""
+    if not isinstance(board, BitBoard):
+        return search_strategy(board)
+    return best_move(board)[0]
+
+
+@register('search')
+def search_strategy(board, rng=None):
+    return search_move(board, budget=0.01).move
+
+
+@register('mcts')
+def mcts_strategy(board, rng):
+    return mcts_move(board, playouts=200, seed=rng.randrange(1 << 30)).move
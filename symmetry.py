@@ -0,0 +1,119 @@
+"""
+Канонизация позиций 3x3 по 8 симметриям квадрата (повороты и отражения)
+Все перестановки клеток и масок считаются один раз при импорте
+"""
+
+from engine import FULL_MASK
+
+
+def _cell_map(transform):
+    return tuple(r * 3 + c for r, c in (transform(i // 3, i % 3) for i in range(9)))
+
+
+# CELL_MAPS[t][i] - куда переходит клетка i при преобразовании t
+CELL_MAPS = tuple(_cell_map(f) for f in (
+    lambda r, c: (r, c),          # тождественное
+    lambda r, c: (c, 2 - r),      # поворот на 90° по часовой
+    lambda r, c: (2 - r, 2 - c),  # поворот на 180°
+    lambda r, c: (2 - c, r),      # поворот на 270°
+    lambda r, c: (r, 2 - c),      # отражение слева направо
+    lambda r, c: (2 - r, c),      # отражение сверху вниз
+    lambda r, c: (c, r),          # главная диагональ
+    lambda r, c: (2 - c, 2 - r),  # побочная диагональ
+))
+
+IDENTITY = 0
+
+# INVERSE[t] - преобразование, отменяющее t
+INVERSE = tuple(
+    next(u for u, other in enumerate(CELL_MAPS) if all(other[cells[i]] == i for i in range(9)))
+    for cells in CELL_MAPS
+)
+
+# MASK_MAPS[t][mask] - образ 9-битной маски
+MASK_MAPS = tuple(
+    tuple(sum(1 << cells[i] for i in range(9) if mask >> i & 1) for mask in range(FULL_MASK + 1))
+    for cells in CELL_MAPS
+)
+
+
+def transform(x, o, t):
+    """Образ позиции при преобразовании t"""
+    table = MASK_MAPS[t]
+    return table[x], table[o]
+
+
+def canonical(x, o):
+    """Каноническая позиция (x, o) и преобразование t, которое к ней приводит
+
+    Каноническая форма - образ с наименьшим ключом x | o << 9.
+    """
+    best_key = x | o << 9
+    best_t = IDENTITY
+    for t in range(1, 8):
+        table = MASK_MAPS[t]
+        key = table[x] | table[o] << 9
+        if key < best_key:
+            best_key = key
+            best_t = t
+    return best_key & FULL_MASK, best_key >> 9, best_t
+
+
+def canonical_key(x, o):
+    """Ключ канонической позиции для словарей и кэшей"""
+    cx, co, _ = canonical(x, o)
+    return cx | co << 9
+
+
+def to_canonical_move(move, t):
+    """Ход исходной позиции в координатах канонической"""
+    return CELL_MAPS[t][move]
+
+
+def from_canonical_move(move, t):
+    """Ход канонической позиции в координатах исходной"""
+    return CELL_MAPS[INVERSE[t]][move]
+
+
+class SymmetricCache:
+    """Кэш позиций, где все 8 симметричных вариантов делят одну запись
+
+    Значения хранятся вместе с ходом в координатах канонической позиции,
+    поэтому get/put принимают и возвращают ход в координатах исходной.
+    """
+
+    def __init__(self):
+        self.table = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.table)
+
+    def get(self, x, o):
+        """(ход, значение) для позиции или None"""
+        cx, co, t = canonical(x, o)
+        entry = self.table.get(cx | co << 9)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        move, value = entry
+        if move is not None:
+            move = from_canonical_move(move, t)
+        return move, value
+
+    def put(self, x, o, move, value):
+        cx, co, t = canonical(x, o)
+        if move is not None:
+            move = to_canonical_move(move, t)
+        self.table[cx | co << 9] = (move, value)
+
+    def discard(self, x, o):
+        """Удаляет запись позиции, если она есть"""
+        self.table.pop(canonical_key(x, o), None)
+
+    def clear(self):
+        self.table.clear()
+        self.hits = 0
+        self.misses = 0
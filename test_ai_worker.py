@@ -0,0 +1,83 @@
+"""
+Юнит-тесты для фонового расчёта ходов ИИ
+"""
+
+import contextlib
+import io
+import queue
+import threading
+import time
+import unittest
+
+from ai_worker import AIWorker
+from engine import BitBoard
+from game import choose_ai_move
+
+
+class TestAIWorker(unittest.TestCase):
+    """Юнит-тесты для AIWorker"""
+
+    def setUp(self):
+        # Очередь играет роль Clock: результаты забираются "потоком интерфейса"
+        self.posted = queue.Queue()
+        self.worker = AIWorker(post=self.posted.put)
+        self.results = []
+
+    def tearDown(self):
+        self.worker.shutdown()
+
+    def pump(self, count=1):
+        for _ in range(count):
+            self.posted.get(timeout=5)()
+
+    def test_result_delivered(self):
+        """Тест: ход приходит через post, расчёт идёт в другом потоке"""
+        board = BitBoard.from_cells(['X', 'X', '', '', 'O', '', '', '', ''])
+        threads = []
+
+        def compute(token):
+            threads.append(threading.current_thread())
+            return choose_ai_move(board, token=token)
+
+        self.worker.submit(compute, lambda move, elapsed: self.results.append(move))
+        self.pump()
+        self.assertEqual(self.results, [2])
+        self.assertIsNot(threads[0], threading.current_thread())
+
+    def test_cancelled_result_dropped(self):
+        """Тест: результат отменённого расчёта отбрасывается"""
+        started = threading.Event()
+
+        def slow(token):
+            started.set()
+            while not token.cancelled:
+                time.sleep(0.001)
+            return 'stale'
+
+        self.worker.submit(slow, lambda result, elapsed: self.results.append(result))
+        started.wait(5)
+        self.worker.cancel()
+        self.pump()
+        self.assertEqual(self.results, [])
+
+    def test_new_task_replaces_old(self):
+        """Тест: новая задача отменяет предыдущую"""
+        first = self.worker.submit(lambda token: 1, lambda result, elapsed: self.results.append(result))
+        self.worker.submit(lambda token: 2, lambda result, elapsed: self.results.append(result))
+        self.pump(2)
+        self.assertTrue(first.cancelled)
+        self.assertEqual(self.results, [2])
+
+    def test_error_reported(self):
+        """Тест: при ошибке расчёта callback получает None"""
+        def broken(token):
+            raise RuntimeError("сбой поиска")
+
+        with contextlib.redirect_stderr(io.StringIO()):
+            self.worker.submit(broken, lambda result, elapsed: self.results.append(result))
+            self.pump()
+        self.assertEqual(self.results, [None])
+
+
+if __name__ == '__main__':
+    unittest.main()
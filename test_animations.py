@@ -0,0 +1,77 @@
+"""
+Юнит-тесты для менеджера анимаций
+"""
+
+import os
+import time
+import unittest
+
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+os.environ.setdefault('KIVY_NO_CONSOLELOG', '1')
+
+try:
+    from kivy.clock import Clock
+    from kivy.properties import NumericProperty
+    from kivy.uix.widget import Widget
+
+    from animations import AnimationManager
+
+    class Target(Widget):
+        scale = NumericProperty(1)
+        pop_scale = NumericProperty(1)
+        highlight = NumericProperty(0)
+except ImportError:
+    AnimationManager = None
+
+
+@unittest.skipIf(AnimationManager is None, "Kivy не установлен")
+class TestAnimationManager(unittest.TestCase):
+    """Юнит-тесты для AnimationManager"""
+
+    def tick(self, seconds=0.05):
+        until = time.perf_counter() + seconds
+        while time.perf_counter() < until:
+            Clock.tick()
+
+    def test_restart_does_not_stack(self):
+        """Тест: повторный запуск эффекта отменяет прежний, анимация одна"""
+        manager = AnimationManager()
+        widget = Target()
+        for _ in range(10):
+            manager.play('pop', widget)
+        self.assertEqual(manager.active_count, 1)
+        manager.cancel('pop', widget)
+        self.assertEqual(manager.active_count, 0)
+        widget.pop_scale = 1
+        self.tick()
+        # Ни один из прежних запусков больше не двигает свойство
+        self.assertEqual(widget.pop_scale, 1)
+
+    def test_count_and_reuse(self):
+        """Тест: счётчик по виджетам и эффектам, последовательности общие"""
+        manager = AnimationManager()
+        first, second = Target(), Target()
+        animation = manager.animations['pop']
+        manager.play('pop', first)
+        manager.play('pop', second)
+        manager.play('highlight', first)
+        self.assertEqual(manager.active_count, 3)
+        self.assertIs(manager.animations['pop'], animation)
+        # Завершение снимает анимацию со счёта
+        animation.stop(first)
+        self.assertEqual(manager.active_count, 2)
+
+    def test_reset(self):
+        """Тест: сброс отменяет все эффекты виджета и возвращает свойства в покой"""
+        manager = AnimationManager()
+        widget = Target()
+        manager.play('pop', widget)
+        manager.play('highlight', widget)
+        self.tick()
+        manager.reset(widget)
+        self.assertEqual(manager.active_count, 0)
+        self.assertEqual((widget.pop_scale, widget.highlight), (1, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+"""
+Юнит-тесты для компактного хранения партий
+"""
+
+import unittest
+
+from arena import SessionArena, arena_games, bytes_per_game
+from game import GameController
+
+
+class TestSessionArena(unittest.TestCase):
+    """Юнит-тесты для SessionArena"""
+
+    def setUp(self):
+        self.arena = SessionArena()
+
+    def test_friend_game(self):
+        """Тест: партия в арене идёт как в GameController"""
+        index = self.arena.create('friend')
+        game = self.arena.session(index)
+        controller = GameController('friend')
+        for position in (0, 3, 1, 4, 2):
+            self.assertEqual(game.make_move(position), controller.make_move(position))
+            self.assertEqual(game.cells, controller.board.cells)
+        self.assertEqual(game.winner, 'X')
+        self.assertTrue(game.game_over)
+        self.assertEqual(game.make_move(5), (False, "Игра завершена"))
+        self.assertEqual(self.arena.moves(index), [0, 3, 1, 4, 2])
+
+    def test_ai_game_matches_controller(self):
+        """Тест: ответ ИИ в арене совпадает с SimpleAI контроллера"""
+        for first in range(9):
+            game = self.arena.session(self.arena.create('ai'))
+            controller = GameController('ai')
+            for position in [first] + list(range(9)):
+                self.assertEqual(game.make_move(position), controller.make_move(position))
+                self.assertEqual(game.cells, controller.board.cells)
+            self.assertEqual(game.winner, controller.winner)
+            self.assertEqual(game.move_count, controller.move_count)
+
+    def test_invalid_moves(self):
+        """Тест: занятая клетка и номер вне поля отклоняются"""
+        game = self.arena.session(self.arena.create())
+        game.make_move(4)
+        for position in (4, 9, -1, 'a'):
+            self.assertEqual(game.make_move(position), (False, "Неверный ход"))
+        self.assertEqual(game.current_player, 'O')
+
+    def test_draw(self):
+        """Тест: заполненная доска без линии - ничья"""
+        game = self.arena.session(self.arena.create())
+        for position in (0, 1, 2, 4, 3, 5, 8, 6):
+            game.make_move(position)
+        self.assertEqual(game.make_move(7), (True, "Ничья"))
+        self.assertIsNone(game.winner)
+
+    def test_release_reuses_slot(self):
+        """Тест: освобождённый слот отдаётся новой партии чистым"""
+        first = self.arena.create('ai')
+        self.arena.make_move(first, 0)
+        second = self.arena.create()
+        self.arena.release(first)
+        self.assertEqual(len(self.arena), 1)
+        with self.assertRaises(KeyError):
+            self.arena.cells(first)
+        self.assertEqual(self.arena.create(), first)
+        self.assertEqual(self.arena.mode(first), 'friend')
+        self.assertEqual(self.arena.cells(first), [''] * 9)
+        self.assertEqual(self.arena.mode(second), 'friend')
+
+    def test_reset(self):
+        """Тест: сброс очищает доску, но сохраняет режим"""
+        index = self.arena.create('ai')
+        self.arena.make_move(index, 0)
+        self.arena.reset(index)
+        self.assertEqual(self.arena.move_count(index), 0)
+        self.assertEqual(self.arena.moves(index), [])
+        self.assertEqual(self.arena.mode(index), 'ai')
+
+    def test_board_round_trip(self):
+        """Тест: слот читается как BitBoard и записывается обратно вместе с порядком ходов"""
+        index = self.arena.create('ai')
+        board = self.arena.board(index)
+        for position in (4, 0, 8):
+            board.make_move(position)
+        self.arena.store(index, board)
+        self.assertEqual(self.arena.moves(index), [4, 0, 8])
+        self.assertEqual(self.arena.cells(index), board.cells())
+        self.assertEqual(self.arena.mode(index), 'ai')
+        restored = self.arena.board(index)
+        self.assertEqual(restored.history, [4, 0, 8])
+        self.assertEqual(restored.current_player, 'O')
+
+    def test_memory_per_game(self):
+        """Тест: партия в арене занимает считанные байты"""
+        self.assertLess(bytes_per_game(arena_games, 20000), 16)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+"""
+Юнит-тесты для пакетного симулятора
+"""
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from batch import BatchGames, book_policy, random_policy, simple_policy, simulate, winners
+from engine import BitBoard, has_win
+from opening_book import OpeningBook, build_book
+
+
+class TestBatch(unittest.TestCase):
+    """Юнит-тесты для партий в массиве NumPy"""
+
+    def test_winners_match_engine(self):
+        """Тест: матричная проверка совпадает с битбордом"""
+        rng = np.random.default_rng(0)
+        boards = rng.integers(-1, 2, size=(500, 9)).astype(np.int8)
+        result = winners(boards)
+        for row, winner in zip(boards, result):
+            cells = ['X' if v == 1 else 'O' if v == -1 else '' for v in row]
+            board = BitBoard.from_cells(cells)
+            expected = -1 if has_win(board.o) else 1 if has_win(board.x) else 0
+            self.assertEqual(winner, expected)
+
+    def test_random_games_finish(self):
+        """Тест: все случайные партии доигрываются"""
+        results = simulate(1000, seed=1)
+        self.assertEqual(sum(results.values()), 1000)
+        self.assertGreater(results['x_wins'], results['o_wins'])
+
+    def test_simple_policy_is_deterministic(self):
+        """Тест: SimpleAI против себя всегда играет одну партию"""
+        games = BatchGames(10)
+        results = games.play(simple_policy)
+        self.assertEqual(max(results.values()), 10)
+        self.assertTrue((games.boards == games.boards[0]).all())
+
+    def test_book_never_loses(self):
+        """Тест: книга против случайной игры не проигрывает"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            book = OpeningBook(build_book(os.path.join(tmpdir, 'book.bin')))
+            results = simulate(2000, random_policy, book_policy(book), seed=2)
+            self.assertEqual(results['x_wins'], 0)
+            results = simulate(2000, book_policy(book), random_policy, seed=3)
+            self.assertEqual(results['o_wins'], 0)
+            book.close()
+
+    def test_occupied_move_rejected(self):
+        """Тест: ход в занятую клетку - ошибка"""
+        games = BatchGames(2)
+        games.step([0, 1])
+        with self.assertRaises(ValueError):
+            games.step([0, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+"""
+Юнит-тесты для бенчмарков
+"""
+
+import unittest
+
+from bench import BENCHMARKS, compare, per_call, run_benchmarks, sample_boards
+
+
+def report(**values):
+    return {'results': {
+        name: {'value': value, 'unit': 's', 'better': 'higher' if name == 'games_per_second' else 'lower'}
+        for name, value in values.items()
+    }}
+
+
+class TestBench(unittest.TestCase):
+    """Юнит-тесты для сравнения с базой и запуска бенчмарков"""
+
+    def test_compare_lower_is_better(self):
+        """Тест: рост времени сверх порога - регрессия, ускорение - нет"""
+        baseline = report(check_winner=1.0, find_winning_move=1.0)
+        regressions = compare(report(check_winner=1.6, find_winning_move=0.5), baseline, 0.5)
+        self.assertEqual([name for name, *_ in regressions], ['check_winner'])
+        self.assertAlmostEqual(regressions[0][3], 0.6)
+        self.assertEqual(compare(report(check_winner=1.4), baseline, 0.5), [])
+
+    def test_compare_higher_is_better(self):
+        """Тест: для партий в секунду регрессия - падение"""
+        baseline = report(games_per_second=1000.0)
+        self.assertEqual(compare(report(games_per_second=2000.0), baseline, 0.5), [])
+        self.assertEqual(len(compare(report(games_per_second=500.0), baseline, 0.5)), 1)
+
+    def test_compare_new_benchmark(self):
+        """Тест: замер, которого нет в базе, не считается регрессией"""
+        self.assertEqual(compare(report(import_ui=5.0), report(), 0.1), [])
+
+    def test_run_subset(self):
+        """Тест: результаты в JSON-совместимом виде с единицами"""
+        result = run_benchmarks(['check_winner', 'games_per_second'])
+        self.assertEqual(set(result['results']), {'check_winner', 'games_per_second'})
+        self.assertEqual(result['results']['games_per_second']['unit'], 'games/s')
+        self.assertGreater(result['results']['check_winner']['value'], 0)
+
+    def test_registry(self):
+        """Тест: все запрошенные замеры зарегистрированы"""
+        for name in ('check_winner', 'find_winning_move', 'ai_move_3x3', 'ai_move_15x15',
+                     'games_per_second', 'build_game_screen', 'move_animation_frame', 'import_game',
+                     'import_ui'):
+            self.assertIn(name, BENCHMARKS)
+
+    def test_helpers(self):
+        """Тест: выборка позиций и замер одного вызова"""
+        self.assertEqual(len(sample_boards(50)), 50)
+        calls = []
+        self.assertGreaterEqual(per_call(lambda: calls.append(1), 10, repeat=2), 0)
+        self.assertEqual(len(calls), 20)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+"""
+Юнит-тесты для виджета игрового поля
+"""
+
+import os
+import unittest
+
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+os.environ.setdefault('KIVY_NO_CONSOLELOG', '1')
+
+try:
+    from board_widget import BoardWidget, cell_at
+except ImportError:
+    BoardWidget = None
+
+
+class Touch:
+    def __init__(self, x, y):
+        self.x, self.y = x, y
+        self.pos = (x, y)
+
+
+@unittest.skipIf(BoardWidget is None, "Kivy не установлен")
+class TestBoardWidget(unittest.TestCase):
+    """Юнит-тесты для BoardWidget"""
+
+    def test_cell_at(self):
+        """Тест: точка переводится в клетку, края поля и промахи - None"""
+        # Поле 3x3 с клетками по 10 и верхним левым углом в (5, 35)
+        self.assertEqual(cell_at(6, 34, 5, 35, 10, 3, 3), 0)
+        self.assertEqual(cell_at(34, 6, 5, 35, 10, 3, 3), 8)
+        self.assertEqual(cell_at(16, 24, 5, 35, 10, 3, 3), 4)
+        self.assertIsNone(cell_at(4, 30, 5, 35, 10, 3, 3))
+        self.assertIsNone(cell_at(10, 36, 5, 35, 10, 3, 3))
+        self.assertIsNone(cell_at(10, 10, 5, 35, 0, 3, 3))
+
+    def test_touch(self):
+        """Тест: касание центра клетки даёт её позицию на любом поле"""
+        for rows, cols in ((3, 3), (19, 19), (7, 15)):
+            board = BoardWidget(pos=(20, 10), size=(400, 300))
+            board.resize(rows, cols)
+            touched = []
+            board.bind(on_cell=lambda instance, position: touched.append(position))
+            for position in (0, cols - 1, rows * cols // 2, rows * cols - 1):
+                row, col = divmod(position, cols)
+                board.on_touch_down(Touch(board.left + (col + 0.5) * board.cell,
+                                          board.top_edge - (row + 0.5) * board.cell))
+            self.assertEqual(touched, [0, cols - 1, rows * cols // 2, rows * cols - 1])
+            self.assertFalse(board.on_touch_down(Touch(5, 5)))
+
+    def test_instructions_do_not_grow(self):
+        """Тест: число инструкций не зависит от размера поля, только от занятых клеток"""
+        board = BoardWidget(size=(400, 400))
+        empty = len(board.canvas.children)
+        board.resize(19, 19)
+        self.assertEqual(len(board.canvas.children), empty)
+        board.set_cell(0, 'X')
+        board.set_cell(360, 'O')
+        board.set_cell(0, 'O')
+        self.assertEqual(len(board.cells), 2)
+        self.assertEqual(len(board.canvas.children), empty)
+        board.set_line((0, 20, 40))
+        board.clear()
+        self.assertEqual(board.cells, {})
+        self.assertEqual(board.fills.children, [])
+        self.assertEqual(board.highlights.children, [])
+
+    def test_render_diff(self):
+        """Тест: render перерисовывает только изменившиеся клетки"""
+        board = BoardWidget(size=(400, 400))
+        board.resize(19, 19)
+        cells = [''] * 361
+        cells[0], cells[180] = 'X', 'O'
+        self.assertEqual(board.render(cells), [0, 180])
+        self.assertEqual(board.render(cells), [])
+        # Отмена: снимается только последний знак
+        cells[180] = ''
+        self.assertEqual(board.render(cells), [180])
+        self.assertEqual(set(board.cells), {0})
+        # Состояние с сервера приходит строкой '.XO'
+        state = '.' * 20 + 'O' + '.' * 340
+        self.assertEqual(board.render(state, (20,)), [0, 20])
+        self.assertEqual(board.rendered[20], 'O')
+        self.assertEqual(board.line, (20,))
+        self.assertEqual(board.render(state), [])
+        self.assertEqual(board.line, ())
+
+    def test_resize_keeps_same_board(self):
+        """Тест: тот же размер поля не сбрасывает нарисованное"""
+        board = BoardWidget()
+        board.set_cell(4, 'X')
+        board.resize(3, 3)
+        self.assertEqual(set(board.cells), {4})
+        board.resize(7, 7)
+        self.assertEqual((board.cells, len(board.rendered)), ({}, 49))
+
+
+if __name__ == '__main__':
+    unittest.main()
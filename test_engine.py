@@ -0,0 +1,74 @@
+"""
+Юнит-тесты для движка без Kivy
+"""
+
+import unittest
+
+from engine import BitBoard, WIN_MASKS, completing_cells
+
+
+class TestBitBoard(unittest.TestCase):
+    """Юнит-тесты для битбордового движка"""
+
+    def setUp(self):
+        self.board = BitBoard()
+
+    def test_win_masks(self):
+        """Тест: 8 линий по 3 клетки"""
+        self.assertEqual(len(WIN_MASKS), 8)
+        self.assertTrue(all(mask.bit_count() == 3 for mask in WIN_MASKS))
+
+    def test_winner_matches_cells(self):
+        """Тест: победитель совпадает со строковой доской"""
+        board = BitBoard.from_cells(['X', 'X', 'X', 'O', 'O', '', '', '', ''])
+        self.assertEqual(board.winner(), 'X')
+        self.assertEqual(board.winning_line(), [0, 1, 2])
+
+        board = BitBoard.from_cells(['', '', 'O', '', 'O', '', 'O', 'X', 'X'])
+        self.assertEqual(board.winner(), 'O')
+
+        board = BitBoard.from_cells(['X', 'O', 'X', 'X', 'O', 'O', 'O', 'X', 'X'])
+        self.assertIsNone(board.winner())
+        self.assertTrue(board.is_full())
+
+    def test_make_move_and_undo(self):
+        """Тест: ход и отмена хода"""
+        self.assertTrue(self.board.make_move(4))
+        self.assertEqual(self.board[4], 'X')
+        self.assertEqual(self.board.current_player, 'O')
+        self.assertFalse(self.board.make_move(4))
+        self.assertFalse(self.board.make_move(9))
+
+        self.assertEqual(self.board.undo(), 4)
+        self.assertEqual(self.board.cells(), [''] * 9)
+        self.assertIsNone(self.board.undo())
+
+    def test_legal_moves(self):
+        """Тест: список свободных клеток"""
+        self.assertEqual(self.board.legal_moves(), list(range(9)))
+        self.board.make_move(0)
+        self.board.make_move(8)
+        self.assertEqual(self.board.legal_moves(), [1, 2, 3, 4, 5, 6, 7])
+
+    def test_winning_move(self):
+        """Тест: поиск выигрышного хода"""
+        board = BitBoard.from_cells(['X', 'X', '', '', '', '', '', '', ''])
+        self.assertEqual(board.winning_move('X'), 2)
+        self.assertIsNone(board.winning_move('O'))
+
+        board = BitBoard.from_cells(['O', '', '', 'O', '', '', '', '', ''])
+        self.assertEqual(board.winning_move('O'), 6)
+
+        # Занятая клетка не считается выигрышной
+        board = BitBoard.from_cells(['X', 'X', 'O', '', '', '', '', '', ''])
+        self.assertIsNone(board.winning_move('X'))
+
+    def test_completing_cells_several(self):
+        """Тест: вилка даёт несколько выигрышных клеток"""
+        board = BitBoard.from_cells(['X', '', '', '', 'X', '', 'X', '', ''])
+        cells = completing_cells(board.x, board.o)
+        self.assertEqual(cells, 1 << 2 | 1 << 3 | 1 << 8)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+"""
+Юнит-тесты для поиска Монте-Карло
+"""
+
+import unittest
+
+from engine import BitBoard
+from mcts import MCTS, mcts_move, merge_stats
+from mnk import MNKBoard
+
+
+class TestMCTS(unittest.TestCase):
+    """Юнит-тесты для UCT"""
+
+    def test_takes_win(self):
+        """Тест: ход в выигрышную клетку"""
+        board = BitBoard.from_cells(['O', 'O', '', 'X', 'X', '', 'X', '', ''])
+        self.assertEqual(mcts_move(board, 500, seed=1).move, 2)
+
+    def test_blocks_threat(self):
+        """Тест: блок угрозы соперника"""
+        board = BitBoard.from_cells(['X', 'X', '', '', 'O', '', '', '', ''])
+        self.assertEqual(mcts_move(board, 2000, seed=1).move, 2)
+
+    def test_board_restored(self):
+        """Тест: после поиска доска не меняется"""
+        board = MNKBoard(9, 9, 5)
+        board.make_move(40)
+        board.make_move(41)
+        MCTS(200, seed=2).run(board)
+        self.assertEqual(board.history, [40, 41])
+        self.assertEqual(board.move_count, 2)
+
+    def test_parallel_playouts(self):
+        """Тест: параллельный режим разыгрывает все розыгрыши"""
+        board = MNKBoard(7, 7, 4)
+        board.make_move(24)
+        result = mcts_move(board, 400, workers=2, seed=3)
+        self.assertEqual(sum(visits for visits, _ in result.stats.values()), 400)
+        self.assertTrue(board.is_empty(result.move))
+        self.assertGreater(result.playouts_per_second, 0)
+
+    def test_merge_stats(self):
+        """Тест: сложение статистики корня"""
+        merged = merge_stats([{1: (2, 1.0)}, {1: (3, 0.5), 4: (1, 1.0)}])
+        self.assertEqual(merged, {1: (5, 1.5), 4: (1, 1.0)})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+"""
+Юнит-тесты для досок m,n,k
+"""
+
+import unittest
+
+from engine import BitBoard
+from mnk import MNKBoard, make_board
+
+
+class TestMNKBoard(unittest.TestCase):
+    """Юнит-тесты для движка m,n,k"""
+
+    def setUp(self):
+        self.board = MNKBoard(15, 15, 5)
+
+    def test_horizontal_win(self):
+        """Тест: пять в ряд по горизонтали"""
+        for col in range(5):
+            self.board.make_move(7 * 15 + col, 'X')
+        self.assertEqual(self.board.winner(), 'X')
+        self.assertEqual(self.board.winning_line(), [105, 106, 107, 108, 109])
+
+    def test_anti_diagonal_win(self):
+        """Тест: пять в ряд по побочной диагонали, последний ход в середине"""
+        cells = [r * 15 + (10 - r) for r in range(5)]
+        for position in cells[:2] + cells[3:]:
+            self.board.make_move(position, 'O')
+        self.assertIsNone(self.board.winner())
+        self.board.make_move(cells[2], 'O')
+        self.assertEqual(self.board.winner(), 'O')
+
+    def test_no_wrap_around_edge(self):
+        """Тест: линия не переносится через край поля"""
+        for position in (12, 13, 14, 15, 16):
+            self.board.make_move(position, 'X')
+        self.assertIsNone(self.board.winner())
+
+    def test_undo_clears_winner(self):
+        """Тест: отмена выигрышного хода снимает победу"""
+        for col in range(5):
+            self.board.make_move(col, 'X')
+        self.assertEqual(self.board.undo(), 4)
+        self.assertIsNone(self.board.winner())
+        self.assertTrue(self.board.is_empty(4))
+
+    def test_winning_move(self):
+        """Тест: поиск выигрышного хода"""
+        for col in range(4):
+            self.board.make_move(col, 'X')
+        self.assertEqual(self.board.winning_move('X'), 4)
+        self.assertIsNone(self.board.winning_move('O'))
+
+    def test_current_player_and_full(self):
+        """Тест: очередь хода и заполнение поля"""
+        board = MNKBoard(2, 2, 2)
+        self.assertEqual(board.current_player, 'X')
+        board.make_move(0)
+        self.assertEqual(board.current_player, 'O')
+        self.assertEqual(board.legal_moves(), [1, 2, 3])
+        self.assertFalse(board.is_full())
+
+    def test_make_board(self):
+        """Тест: классика использует битборд"""
+        self.assertIsInstance(make_board(), BitBoard)
+        self.assertIsInstance(make_board(15, 15, 5), MNKBoard)
+        with self.assertRaises(ValueError):
+            MNKBoard(3, 3, 5)
+        for k in (0, -2):
+            with self.assertRaises(ValueError):
+                make_board(5, 5, k)
+
+
+if __name__ == '__main__':
+    unittest.main()
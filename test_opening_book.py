@@ -0,0 +1,65 @@
+"""
+Юнит-тесты для книги ходов
+"""
+
+import os
+import tempfile
+import unittest
+
+from engine import BitBoard
+from opening_book import (
+    BOOK_SIZE, OpeningBook, build_book, decode, encode, reachable_positions
+)
+from solver import Solver
+
+
+class TestOpeningBook(unittest.TestCase):
+    """Юнит-тесты для книги ходов"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        cls.path = build_book(os.path.join(cls.tmpdir.name, 'book.bin'))
+        cls.book = OpeningBook(cls.path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.book.close()
+        cls.tmpdir.cleanup()
+
+    def test_reachable_count(self):
+        """Тест: 5478 достижимых позиций"""
+        self.assertEqual(len(reachable_positions()), 5478)
+
+    def test_encode_roundtrip(self):
+        """Тест: троичный индекс обратим"""
+        board = BitBoard.from_cells(['X', '', 'O', '', 'X', '', '', 'O', ''])
+        index = encode(board.x, board.o)
+        self.assertEqual(index, 1 + 2 * 9 + 81 + 2 * 3 ** 7)
+        self.assertEqual(decode(index), (board.x, board.o))
+
+    def test_file_size(self):
+        """Тест: размер файла 3^9 байт"""
+        self.assertEqual(os.path.getsize(self.path), BOOK_SIZE)
+
+    def test_matches_solver(self):
+        """Тест: книга совпадает с решателем"""
+        solver = Solver()
+        for x, o in reachable_positions():
+            entry = self.book.lookup(x, o)
+            move, value = solver.solve(x, o)
+            if move is None:
+                self.assertIsNone(entry)
+            else:
+                self.assertEqual(entry[1], value)
+                board = BitBoard(x, o)
+                self.assertTrue(board.is_empty(entry[0]))
+
+    def test_best_move(self):
+        """Тест: книга находит выигрыш"""
+        board = BitBoard.from_cells(['O', 'O', '', 'X', 'X', '', 'X', '', ''])
+        self.assertEqual(self.book.best_move(board), (2, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
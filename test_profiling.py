@@ -0,0 +1,126 @@
+"""
+Юнит-тесты для профилирования
+"""
+
+import json
+import os
+import random
+import tempfile
+import unittest
+
+from profiling import (Histogram, Profiler, StartupReport, SUB_BUCKETS, bucket_bounds,
+                       bucket_index, profiler_from_env, startup_report_from_env)
+
+
+class TestHistogram(unittest.TestCase):
+    """Юнит-тесты для Histogram"""
+
+    def test_buckets_cover_values(self):
+        """Тест: значение лежит в границах своей корзины, корзины идут подряд"""
+        for value in list(range(5000)) + [10 ** 6, 10 ** 9, 2 ** 40 + 7]:
+            low, high = bucket_bounds(bucket_index(value))
+            self.assertLessEqual(low, value)
+            self.assertLessEqual(value, high)
+        for index in range(1, 2000):
+            self.assertEqual(bucket_bounds(index)[0], bucket_bounds(index - 1)[1] + 1)
+
+    def test_relative_error(self):
+        """Тест: ширина корзины не больше 1/32 её нижней границы"""
+        for index in range(SUB_BUCKETS, 3000):
+            low, high = bucket_bounds(index)
+            self.assertLessEqual(high - low + 1, low / 32 + 1)
+
+    def test_percentiles(self):
+        """Тест: перцентили совпадают с точными с точностью корзины"""
+        rng = random.Random(1)
+        values = [rng.expovariate(1 / 0.005) for _ in range(10000)]
+        histogram = Histogram()
+        for value in values:
+            histogram.record(value)
+        values.sort()
+        for percent in (50, 90, 99):
+            exact = values[int(len(values) * percent / 100) - 1] * 1e6
+            self.assertAlmostEqual(histogram.percentile(percent) / exact, 1, delta=0.05)
+        self.assertEqual(histogram.total, 10000)
+        self.assertEqual(histogram.percentile(100), histogram.max)
+
+    def test_merge_and_summary(self):
+        """Тест: слияние гистограмм и сводка в миллисекундах"""
+        first, second = Histogram(), Histogram()
+        first.record(0.001)
+        second.record(0.003)
+        first.merge(second)
+        summary = first.to_dict()
+        self.assertEqual(summary['count'], 2)
+        self.assertEqual(summary['min_ms'], 1.0)
+        self.assertEqual(summary['max_ms'], 3.0)
+        self.assertEqual(summary['mean_ms'], 2.0)
+        self.assertEqual(sum(summary['buckets'].values()), 2)
+        self.assertEqual(Histogram().to_dict()['p99_ms'], 0)
+
+
+class TestProfiler(unittest.TestCase):
+    """Юнит-тесты для Profiler"""
+
+    def test_instrument(self):
+        """Тест: обёрнутые методы пишут время, поведение не меняется"""
+        class Game:
+            def make_move(self, position):
+                return position * 2
+
+        game = Game()
+        profiler = Profiler()
+        profiler.instrument(game, ['make_move'])
+        self.assertEqual(game.make_move(3), 6)
+        self.assertEqual(game.make_move.__name__, 'make_move')
+        self.assertEqual(profiler.histograms['make_move'].total, 1)
+        # Другие экземпляры не затронуты
+        self.assertNotIn('make_move', vars(Game()))
+
+    def test_dump(self):
+        """Тест: отчёт выгружается в JSON"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'profile.json')
+            profiler = Profiler(path)
+            profiler.frame(1 / 60)
+            profiler.record('check_game_result', 0.0002)
+            for count in (2, 5, 1):
+                profiler.gauge('active_animations', count)
+            self.assertEqual(profiler.dump(), path)
+            with open(path, encoding='utf-8') as f:
+                report = json.load(f)
+        self.assertEqual(set(report['histograms']), {'frame', 'check_game_result'})
+        self.assertEqual(report['histograms']['frame']['count'], 1)
+        self.assertEqual(report['gauges'], {'active_animations': 5})
+
+    def test_env_toggle(self):
+        """Тест: без переменной окружения профилирование выключено"""
+        self.assertIsNone(profiler_from_env({}))
+        self.assertIsNone(profiler_from_env({'TICTACTOE_PROFILE': '0'}))
+        self.assertEqual(profiler_from_env({'TICTACTOE_PROFILE': '1'}).path, 'profile.json')
+        self.assertEqual(profiler_from_env({'TICTACTOE_PROFILE': '/tmp/p.json'}).path, '/tmp/p.json')
+
+
+class TestStartupReport(unittest.TestCase):
+    """Юнит-тесты для StartupReport"""
+
+    def test_stages(self):
+        """Тест: длительность этапа считается от предыдущей отметки"""
+        report = StartupReport(origin=10.0)
+        report.mark('import', 10.2)
+        report.mark('build', 10.25)
+        report.mark('first_frame', 10.4)
+        stages = [(name, round(seconds, 3)) for name, seconds in report.durations()]
+        self.assertEqual(stages, [('import', 0.2), ('build', 0.05), ('first_frame', 0.15)])
+        self.assertEqual(report.format(),
+                         "Запуск: import 200 мс, build 50 мс, first_frame 150 мс; всего 400 мс")
+
+    def test_env_toggle(self):
+        """Тест: отчёт о запуске включается переменной окружения"""
+        self.assertIsNone(startup_report_from_env({}))
+        self.assertIsNone(startup_report_from_env({'TICTACTOE_STARTUP': '0'}))
+        self.assertIsInstance(startup_report_from_env({'TICTACTOE_STARTUP': '1'}), StartupReport)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+"""
+Юнит-тесты для журнала партий
+"""
+
+import os
+import random
+import tempfile
+import unittest
+
+from records import (GameIndex, GameLog, GameRecord, decode_record, encode_record,
+                     encode_varint, index_is_valid, index_path, read_records, read_varint,
+                     record_from_board, replay, varint_at)
+from mnk import make_board
+
+
+def random_game(rng, rows=3, cols=3, k=3):
+    board = make_board(rows, cols, k)
+    while board.winner() is None and not board.is_full():
+        board.make_move(rng.choice(board.legal_moves()))
+    return board
+
+
+class TestRecordFormat(unittest.TestCase):
+    """Юнит-тесты для формата записи"""
+
+    def test_roundtrip_3x3(self):
+        """Тест: партия 3x3 занимает байт заголовка и полбайта на ход"""
+        rng = random.Random(1)
+        for _ in range(200):
+            record = record_from_board(random_game(rng))
+            data = encode_record(record)
+            self.assertEqual(len(data), 1 + (len(record.moves) + 1) // 2)
+            self.assertEqual(decode_record(data), record)
+
+    def test_roundtrip_large_boards(self):
+        """Тест: большие поля - байт на ход, на 19x19 - два байта"""
+        rng = random.Random(2)
+        for rows, cols, k in ((7, 7, 4), (15, 15, 5), (19, 19, 5)):
+            board = make_board(rows, cols, k)
+            for _ in range(20):
+                board.make_move(rng.choice(board.legal_moves()))
+            record = record_from_board(board)
+            data = encode_record(record)
+            width = 1 if rows * cols <= 256 else 2
+            self.assertEqual(len(data), 4 + width * 20)
+            self.assertEqual(decode_record(data), record)
+
+    def test_results(self):
+        """Тест: победа, ничья и незаконченная партия"""
+        won = GameRecord(3, 3, 3, (0, 3, 1, 4, 2), 'X')
+        drawn = GameRecord(3, 3, 3, (0, 1, 2, 4, 3, 5, 7, 6, 8), 'draw')
+        for record in (won, drawn, GameRecord(3, 3, 3, (), None)):
+            self.assertEqual(decode_record(encode_record(record)), record)
+        self.assertEqual(record_from_board(replay(drawn)), drawn)
+        self.assertEqual(replay(won).winner(), 'X')
+
+    def test_varint(self):
+        """Тест: varint для малых и больших длин"""
+        for value in (0, 1, 127, 128, 300, 1 << 20):
+            data = encode_varint(value)
+            chunks = iter([data[i:i + 1] for i in range(len(data))])
+            self.assertEqual(read_varint(lambda n: next(chunks, b'')), value)
+        self.assertEqual(len(encode_varint(127)), 1)
+        self.assertIsNone(read_varint(lambda n: b''))
+
+
+class TestGameLog(unittest.TestCase):
+    """Юнит-тесты для GameLog, read_records и GameIndex"""
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, 'games.log')
+        rng = random.Random(3)
+        self.records = [record_from_board(random_game(rng)) for _ in range(500)]
+        self.records.append(record_from_board(random_game(rng, 15, 15, 5)))
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def write(self, records):
+        with GameLog(self.path) as log:
+            return [log.append(record) for record in records]
+
+    def test_stream_and_seek(self):
+        """Тест: потоковое чтение и доступ по номеру дают те же партии"""
+        numbers = self.write(self.records)
+        self.assertEqual(numbers, list(range(len(self.records))))
+        self.assertEqual(list(read_records(self.path)), self.records)
+        with GameIndex(self.path) as games:
+            self.assertEqual(len(games), len(self.records))
+            for number in (0, 250, len(self.records) - 1, -1):
+                self.assertEqual(games[number], self.records[number])
+            with self.assertRaises(IndexError):
+                games[len(self.records)]
+
+    def test_append_after_reopen(self):
+        """Тест: повторное открытие продолжает нумерацию"""
+        self.write(self.records[:10])
+        self.assertEqual(self.write(self.records[10:12]), [10, 11])
+        with GameIndex(self.path) as games:
+            self.assertEqual(games[11], self.records[11])
+
+    def test_torn_tail_recovered(self):
+        """Тест: обрывок записи после сбоя отрезается, индекс перестраивается"""
+        self.write(self.records[:5])
+        with open(self.path, 'ab') as f:
+            f.write(b'\x09\x04')
+        os.remove(index_path(self.path))
+        self.assertEqual(len(list(read_records(self.path))), 5)
+        with GameIndex(self.path) as games:
+            self.assertEqual(len(games), 5)
+        self.assertEqual(self.write(self.records[5:6]), [5])
+        self.assertEqual(list(read_records(self.path)), self.records[:6])
+
+    def test_empty_log(self):
+        """Тест: пустой журнал читается без ошибок"""
+        self.write([])
+        self.assertEqual(list(read_records(self.path)), [])
+        with GameIndex(self.path) as games:
+            self.assertEqual(len(games), 0)
+
+    def test_index_never_ahead_of_log(self):
+        """Тест: без flush индекс на диске не ссылается на недописанные записи"""
+        flushed = 0
+        with GameLog(self.path, buffer_size=1024) as log:
+            for i in range(3000):
+                log.append(self.records[i % 500])
+                with open(index_path(self.path), 'rb') as f:
+                    index = f.read()
+                if not index:
+                    continue
+                flushed = len(index) // 8
+                with open(self.path, 'rb') as f:
+                    data = f.read()
+                length, start = varint_at(data, int.from_bytes(index[-8:], 'little'))
+                self.assertLessEqual(start + length, len(data))
+        self.assertGreater(flushed, 0)
+        self.assertTrue(index_is_valid(self.path))
+        self.assertEqual(os.path.getsize(index_path(self.path)) // 8, 3000)
+
+    def test_compact(self):
+        """Тест: партия 3x3 в журнале занимает несколько байт"""
+        self.write(self.records[:500])
+        self.assertLess(os.path.getsize(self.path) / 500, 8)
+
+
+if __name__ == '__main__':
+    unittest.main()
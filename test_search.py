@@ -0,0 +1,105 @@
+"""
+Юнит-тесты для поиска с ограничением по времени
+"""
+
+import random
+import time
+import unittest
+
+from engine import BitBoard
+from mnk import MNKBoard
+from search import CancelToken, Searcher, candidate_moves, evaluate, search_move
+
+
+class TestSearch(unittest.TestCase):
+    """Юнит-тесты для итеративного углубления"""
+
+    def test_takes_win_on_large_board(self):
+        """Тест: четыре в ряд достраиваются до пяти"""
+        board = MNKBoard(15, 15, 5)
+        for i in range(4):
+            board.make_move(105 + i, 'X')
+            board.make_move(i, 'O')
+        result = search_move(board, budget=0.2)
+        self.assertIn(result.move, (104, 109))
+
+    def test_blocks_on_large_board(self):
+        """Тест: блок четвёрки соперника"""
+        board = MNKBoard(15, 15, 5)
+        for x, o in zip((104, 30, 32, 34), (105, 106, 107, 108)):
+            board.make_move(x, 'X')
+            board.make_move(o, 'O')
+        self.assertEqual(board.current_player, 'X')
+        result = search_move(board, budget=0.2)
+        self.assertEqual(result.move, 109)
+
+    def test_budget_respected(self):
+        """Тест: поиск укладывается в бюджет"""
+        board = MNKBoard(15, 15, 5)
+        for position in (112, 113, 97, 128):
+            board.make_move(position)
+        started = time.perf_counter()
+        result = search_move(board, budget=0.05)
+        self.assertLess(time.perf_counter() - started, 0.2)
+        self.assertIsNotNone(result.move)
+        self.assertTrue(board.is_empty(result.move))
+        self.assertEqual(board.history, [112, 113, 97, 128])
+
+    def test_cancelled_returns_fallback(self):
+        """Тест: отменённый поиск всё равно возвращает допустимый ход"""
+        token = CancelToken()
+        token.cancel()
+        board = MNKBoard(15, 15, 5)
+        board.make_move(112)
+        result = search_move(board, budget=1.0, token=token)
+        self.assertEqual(result.depth, 0)
+        self.assertIn(result.move, candidate_moves(board))
+
+    def test_cancelled_blocks_four(self):
+        """Тест: без единой глубины берётся лучший статический ход - блок четвёрки"""
+        token = CancelToken()
+        token.cancel()
+        board = MNKBoard(15, 15, 5)
+        for x, o in zip((104, 30, 32, 34), (105, 106, 107, 108)):
+            board.make_move(x, 'X')
+            board.make_move(o, 'O')
+        result = search_move(board, budget=1.0, token=token)
+        self.assertEqual(result.depth, 0)
+        self.assertEqual(result.move, 109)
+
+    def test_crowded_large_board_searched(self):
+        """Тест: на заполненном поле 19x19 первая глубина успевает в бюджет"""
+        rng = random.Random(3)
+        board = MNKBoard(19, 19, 5)
+        for position in rng.sample(range(board.size), 60):
+            board.make_move(position)
+            if board.winner() is not None:
+                board.undo()
+        started = time.perf_counter()
+        result = search_move(board, budget=0.05)
+        self.assertLess(time.perf_counter() - started, 0.2)
+        self.assertGreaterEqual(result.depth, 1)
+
+    def test_incremental_score_matches_evaluate(self):
+        """Тест: оценка после ходов поиска совпадает с полным пересчётом"""
+        board = MNKBoard(7, 7, 4)
+        searcher = Searcher(budget=1.0)
+        searcher.search(board)
+        for position in (24, 25, 17, 31, 18):
+            searcher.play(board, position, board.current_player)
+            self.assertEqual(searcher.total, evaluate(board, 'X'))
+        for _ in range(5):
+            searcher.unplay(board)
+        self.assertEqual(searcher.total, evaluate(board, 'X'))
+        self.assertEqual(board.history, [])
+
+    def test_perfect_on_classic_board(self):
+        """Тест: на 3x3 полный перебор находит ничью"""
+        board = BitBoard.from_cells(['X', '', '', '', 'O', '', '', '', 'X'])
+        result = search_move(board, budget=1.0)
+        self.assertIn(result.move, (1, 3, 5, 7))
+        self.assertEqual(result.score, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,192 @@
+"""
+Юнит-тесты для игрового сервера и нагрузочного теста
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+
+from loadtest import percentile, run_load
+from records import GameLog, read_records
+from server import GameServer
+
+
+class Client:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    async def send(self, **message):
+        self.writer.write(json.dumps(message).encode() + b'\n')
+        await self.writer.drain()
+        return await self.receive()
+
+    async def receive(self):
+        return json.loads(await asyncio.wait_for(self.reader.readline(), 5))
+
+    def close(self):
+        self.writer.close()
+
+
+class TestGameServer(unittest.IsolatedAsyncioTestCase):
+    """Юнит-тесты для GameServer"""
+
+    async def asyncSetUp(self):
+        self.server = GameServer()
+        self.port = await self.server.start()
+        self.clients = []
+
+    async def asyncTearDown(self):
+        for client in self.clients:
+            client.close()
+        await self.server.stop()
+
+    async def connect(self):
+        client = Client(*await asyncio.open_connection('127.0.0.1', self.port))
+        self.clients.append(client)
+        return client
+
+    async def test_ai_game(self):
+        """Тест: после хода игрока сервер сразу отвечает ходом ИИ"""
+        client = await self.connect()
+        state = await client.send(op='create', mode='ai')
+        self.assertTrue(state['ok'])
+        self.assertEqual(state['player'], 'X')
+        state = await client.send(op='move', session=state['session'], position=0)
+        self.assertTrue(state['ok'])
+        self.assertEqual(state['cells'].count('X'), 1)
+        self.assertEqual(state['cells'].count('O'), 1)
+        self.assertEqual(state['turn'], 'X')
+
+    async def test_invalid_moves(self):
+        """Тест: занятая клетка, чужой ход и мусор отклоняются"""
+        x = await self.connect()
+        o = await self.connect()
+        session = (await x.send(op='create', mode='friend'))['session']
+        await o.send(op='join', session=session)
+        await x.receive()  # уведомление о подключении соперника
+
+        reply = await o.send(op='move', session=session, position=4)
+        self.assertFalse(reply['ok'])
+        self.assertEqual(reply['error'], "Сейчас не ваш ход")
+
+        await x.send(op='move', session=session, position=4)
+        await o.receive()
+        for position in (4, 9, -1, 'a'):
+            reply = await o.send(op='move', session=session, position=position)
+            self.assertFalse(reply['ok'])
+            self.assertEqual(reply['error'], "Неверный ход")
+
+        self.assertFalse((await o.send(op='move', session=999, position=0))['ok'])
+        self.assertFalse((await o.send(op='dance'))['ok'])
+        o.writer.write(b'not json\n')
+        self.assertEqual((await o.receive())['error'], "Неверный JSON")
+
+    async def test_friend_game_with_spectator(self):
+        """Тест: игроки и зритель получают состояние, победа завершает игру"""
+        x = await self.connect()
+        o = await self.connect()
+        viewer = await self.connect()
+        session = (await x.send(op='create', mode='friend'))['session']
+        self.assertEqual((await o.send(op='join', session=session))['player'], 'O')
+        await x.receive()
+        self.assertTrue((await viewer.send(op='spectate', session=session))['ok'])
+
+        for player, other, position in ((x, o, 0), (o, x, 3), (x, o, 1), (o, x, 4), (x, o, 2)):
+            state = await player.send(op='move', session=session, position=position)
+            self.assertTrue(state['ok'])
+            event = await other.receive()
+            self.assertEqual(event['event'], 'state')
+            self.assertEqual((await viewer.receive())['cells'], state['cells'])
+
+        self.assertEqual(state['winner'], 'X')
+        self.assertTrue(state['over'])
+        reply = await o.send(op='move', session=session, position=5)
+        self.assertEqual(reply['error'], "Игра завершена")
+
+    async def test_finished_games_logged(self):
+        """Тест: законченная партия попадает в журнал"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'games.log')
+            self.server.log = GameLog(path)
+            x = await self.connect()
+            o = await self.connect()
+            session = (await x.send(op='create', mode='friend'))['session']
+            await o.send(op='join', session=session)
+            await x.receive()
+            for player, other, position in ((x, o, 0), (o, x, 3), (x, o, 1), (o, x, 4), (x, o, 2)):
+                await player.send(op='move', session=session, position=position)
+                await other.receive()
+            self.server.log.close()
+            records = list(read_records(path))
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0].moves, (0, 3, 1, 4, 2))
+        self.assertEqual(records[0].result, 'X')
+
+    async def test_large_board(self):
+        """Тест: партия на поле 15x15 с ходом ИИ поиском"""
+        client = await self.connect()
+        state = await client.send(op='create', mode='ai', size=[15, 15, 5])
+        self.assertEqual(len(state['cells']), 225)
+        state = await client.send(op='move', session=state['session'], position=112)
+        self.assertEqual(state['cells'].count('O'), 1)
+        self.assertFalse((await client.send(op='create', size=[0, 3, 3]))['ok'])
+        for k in (0, -1, 6):
+            self.assertFalse((await client.send(op='create', size=[5, 5, k]))['ok'])
+
+    async def test_session_removed_on_disconnect(self):
+        """Тест: партия удаляется, когда уходят все игроки"""
+        client = await self.connect()
+        await client.send(op='create', mode='ai')
+        self.assertEqual(len(self.server.sessions), 1)
+        self.assertEqual(len(self.server.arena), 1)
+        client.close()
+        await client.writer.wait_closed()
+        for _ in range(100):
+            if not self.server.sessions:
+                break
+            await asyncio.sleep(0.01)
+        self.assertEqual(self.server.sessions, {})
+        self.assertEqual(len(self.server.arena), 0)
+
+    async def test_small_board_in_arena(self):
+        """Тест: позиция партии 3x3 хранится в арене сервера вместе с порядком ходов"""
+        client = await self.connect()
+        session_id = (await client.send(op='create', mode='ai'))['session']
+        await client.send(op='move', session=session_id, position=0)
+        session = self.server.sessions[session_id]
+        self.assertIsNone(session.own_board)
+        moves = self.server.arena.moves(session.slot)
+        self.assertEqual(moves[0], 0)
+        self.assertEqual(len(moves), 2)
+        large = (await client.send(op='create', size=[5, 5, 4]))['session']
+        self.assertIsNone(self.server.sessions[large].slot)
+        self.assertEqual(len(self.server.arena), 1)
+
+
+class TestLoad(unittest.TestCase):
+    """Юнит-тесты для нагрузочного теста"""
+
+    def test_percentile(self):
+        """Тест: перцентили по отсортированной выборке"""
+        values = [i / 100 for i in range(100)]
+        self.assertEqual(percentile(values, 0.5), 0.5)
+        self.assertEqual(percentile(values, 0.99), 0.99)
+        self.assertEqual(percentile([], 0.99), 0.0)
+
+    def test_small_load(self):
+        """Тест: все клиенты доигрывают партии без ошибок"""
+        result = asyncio.run(run_load(clients=50, concurrency=20, seed=1))
+        self.assertEqual(result.errors, 0)
+        self.assertEqual(result.clients, 50)
+        # Крестики делают от 3 до 5 ходов за партию
+        self.assertGreaterEqual(result.moves, 150)
+        self.assertLessEqual(result.moves, 250)
+        self.assertGreater(result.moves_per_second, 0)
+        self.assertLessEqual(result.p50, result.p99)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+"""
+Юнит-тесты для точного решателя
+"""
+
+import unittest
+
+from engine import BitBoard
+from solver import Solver, best_move
+
+
+class TestSolver(unittest.TestCase):
+    """Юнит-тесты для негамакс-решателя"""
+
+    def setUp(self):
+        self.solver = Solver()
+
+    def test_empty_board_is_draw(self):
+        """Тест: пустая доска - ничья при идеальной игре"""
+        move, value = self.solver.best_move(BitBoard())
+        self.assertIn(move, range(9))
+        self.assertEqual(value, 0)
+
+    def test_takes_win(self):
+        """Тест: решатель выигрывает сразу"""
+        board = BitBoard.from_cells(['O', 'O', '', 'X', 'X', '', 'X', '', ''])
+        move, value = self.solver.best_move(board)
+        self.assertEqual(move, 2)
+        self.assertEqual(value, 1)
+
+    def test_blocks_threat(self):
+        """Тест: решатель блокирует угрозу"""
+        board = BitBoard.from_cells(['X', 'X', '', '', 'O', '', '', '', ''])
+        move, _ = self.solver.best_move(board)
+        self.assertEqual(move, 2)
+
+    def test_avoids_fork(self):
+        """Тест: против углов по диагонали нужно ходить на сторону"""
+        board = BitBoard.from_cells(['X', '', '', '', 'O', '', '', '', 'X'])
+        move, value = self.solver.best_move(board)
+        self.assertIn(move, (1, 3, 5, 7))
+        self.assertEqual(value, 0)
+
+    def test_terminal_position(self):
+        """Тест: в законченной партии хода нет"""
+        board = BitBoard.from_cells(['X', 'X', 'X', 'O', 'O', '', '', '', ''])
+        self.assertEqual(self.solver.best_move(board), (None, 0))
+
+    def test_never_loses(self):
+        """Тест: решатель не проигрывает ни одному сопернику"""
+        def play(board):
+            winner = board.winner()
+            if winner or board.is_full():
+                return winner
+            if board.current_player == 'O':
+                move, _ = best_move(board)
+                board.make_move(move)
+                result = play(board)
+                board.undo()
+                return result
+            for move in board.legal_moves():
+                board.make_move(move)
+                result = play(board)
+                board.undo()
+                if result == 'X':
+                    return 'X'
+            return None
+
+        self.assertIsNone(play(BitBoard()))
+
+    def test_table_stays_warm(self):
+        """Тест: повторный поиск идёт из таблицы"""
+        self.solver.best_move(BitBoard())
+        nodes = self.solver.nodes
+        self.solver.best_move(BitBoard())
+        self.assertLess(self.solver.nodes - nodes, 10)
+
+    def test_symmetric_positions_share_entry(self):
+        """Тест: повёрнутая позиция решается из той же записи таблицы"""
+        board = BitBoard.from_cells(['X', '', '', '', 'O', '', '', '', ''])
+        self.solver.best_move(board)
+        size, nodes = len(self.solver.table), self.solver.nodes
+        rotated = BitBoard.from_cells(['', '', 'X', '', 'O', '', '', '', ''])
+        move, value = self.solver.best_move(rotated)
+        self.assertEqual(len(self.solver.table), size)
+        self.assertLess(self.solver.nodes - nodes, 10)
+        self.assertTrue(rotated.is_empty(move))
+        self.assertEqual(value, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+"""
+Юнит-тесты для постоянной статистики
+"""
+
+import os
+import queue
+import sqlite3
+import tempfile
+import time
+import unittest
+
+from game import TicTacToeGame, board_key
+from stats import StatsStore
+
+
+class TestStatsStore(unittest.TestCase):
+    """Юнит-тесты для StatsStore"""
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, 'stats.db')
+        self.stores = []
+
+    def tearDown(self):
+        for store in self.stores:
+            store.close()
+        self.dir.cleanup()
+
+    def open(self, delay=0.05):
+        store = StatsStore(self.path, delay)
+        self.stores.append(store)
+        return store
+
+    def totals(self, store, mode='ai', board='3x3x3'):
+        results = queue.Queue()
+        store.totals(mode, board, results.put)
+        return results.get(timeout=5)
+
+    def test_totals_persist(self):
+        """Тест: итоги сохраняются между запусками по режиму и полю"""
+        store = self.open()
+        for result in ('X', 'O', 'O', 'draw'):
+            store.record('ai', '3x3x3', result)
+        store.record('friend', '15x15x5', 'X')
+        store.close()
+
+        store = self.open()
+        self.assertEqual(self.totals(store), {'X': 1, 'O': 2, 'draw': 1})
+        self.assertEqual(self.totals(store, 'friend', '15x15x5'), {'X': 1, 'O': 0, 'draw': 0})
+        self.assertEqual(self.totals(store, 'friend', '3x3x3'), {'X': 0, 'O': 0, 'draw': 0})
+
+    def test_writes_batched(self):
+        """Тест: партии за время задержки пишутся одной транзакцией"""
+        store = self.open(delay=0.2)
+        for _ in range(50):
+            store.record('ai', '3x3x3', 'draw')
+        time.sleep(0.4)
+        self.assertEqual(store.batches, 1)
+        store.flush()
+        with sqlite3.connect(self.path) as connection:
+            self.assertEqual(connection.execute('SELECT COUNT(*) FROM games').fetchone()[0], 50)
+            self.assertEqual(connection.execute('PRAGMA journal_mode').fetchone()[0], 'wal')
+
+    def test_record_does_not_wait(self):
+        """Тест: record() не ждёт базу"""
+        store = self.open(delay=1.0)
+        started = time.perf_counter()
+        for _ in range(1000):
+            store.record('friend', '3x3x3', 'X')
+        self.assertLess(time.perf_counter() - started, 0.1)
+        self.assertEqual(store.batches, 0)
+        store.flush()
+        self.assertEqual(self.totals(store, 'friend')['X'], 1000)
+
+    def test_unknown_result(self):
+        """Тест: неизвестный итог отклоняется сразу"""
+        with self.assertRaises(ValueError):
+            self.open().record('ai', '3x3x3', 'Z')
+
+    def test_game_scores(self):
+        """Тест: счёт партии подгружается из базы и пополняется итогами"""
+        store = self.open()
+        store.record('ai', '3x3x3', 'X')
+        game = TicTacToeGame()
+        game.stats = store
+        game.game_mode = 'ai'
+        game.player_x_score = 7
+        game.load_scores()
+        # До ответа базы счёт обнулён, затем к нему прибавляются итоги
+        store.flush()
+        self.assertEqual((game.player_x_score, game.player_o_score, game.ties), (1, 0, 0))
+
+        game.update_score('O')
+        game.record_result('O')
+        game.record_result(None)
+        store.flush()
+        self.assertEqual(self.totals(store), {'X': 1, 'O': 1, 'draw': 1})
+        self.assertEqual(board_key(game.engine), '3x3x3')
+
+    def test_stale_totals_ignored(self):
+        """Тест: итоги, запрошенные для прежней партии, не попадают в счёт новой"""
+        store = self.open()
+        store.record('ai', '3x3x3', 'X')
+        store.flush()
+        replies = []
+        game = TicTacToeGame()
+        # Ответы придерживаются, как если бы Clock ещё не дошёл до них
+        store.post = replies.append
+        game.stats = store
+        game.game_mode = 'ai'
+        game.load_scores()
+        game.game_mode = 'friend'
+        game.load_scores()
+        store.flush()
+        for reply in replies:
+            reply()
+        self.assertEqual((game.player_x_score, game.player_o_score, game.ties), (0, 0, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+"""
+Юнит-тесты для симметрий доски
+"""
+
+import unittest
+
+from engine import BitBoard
+from opening_book import reachable_positions
+from symmetry import (
+    CELL_MAPS, INVERSE, SymmetricCache, canonical, from_canonical_move, transform
+)
+
+
+class TestSymmetry(unittest.TestCase):
+    """Юнит-тесты для канонизации позиций"""
+
+    def test_group(self):
+        """Тест: 8 разных перестановок и обратные к ним"""
+        self.assertEqual(len(set(CELL_MAPS)), 8)
+        for t, cells in enumerate(CELL_MAPS):
+            self.assertEqual(sorted(cells), list(range(9)))
+            inverse = CELL_MAPS[INVERSE[t]]
+            self.assertEqual([inverse[cells[i]] for i in range(9)], list(range(9)))
+
+    def test_canonical_same_for_all_images(self):
+        """Тест: все образы позиции дают одну каноническую форму"""
+        board = BitBoard.from_cells(['X', 'O', '', '', 'X', '', '', '', 'O'])
+        expected = canonical(board.x, board.o)[:2]
+        for t in range(8):
+            x, o = transform(board.x, board.o, t)
+            self.assertEqual(canonical(x, o)[:2], expected)
+
+    def test_canonical_transform(self):
+        """Тест: возвращаемое преобразование приводит к канонической форме"""
+        board = BitBoard.from_cells(['', '', 'X', '', 'O', '', '', '', ''])
+        cx, co, t = canonical(board.x, board.o)
+        self.assertEqual(transform(board.x, board.o, t), (cx, co))
+        self.assertEqual(BitBoard(cx, co)[from_canonical_move(2, INVERSE[t])], 'X')
+
+    def test_class_count(self):
+        """Тест: 765 классов достижимых позиций"""
+        classes = {canonical(x, o)[:2] for x, o in reachable_positions()}
+        self.assertEqual(len(classes), 765)
+
+    def test_cache_maps_moves(self):
+        """Тест: кэш возвращает ход в координатах запрошенной позиции"""
+        cache = SymmetricCache()
+        board = BitBoard.from_cells(['X', 'X', '', '', 'O', '', '', '', ''])
+        cache.put(board.x, board.o, 2, 1)
+
+        # Та же позиция, повёрнутая на 90°: угроза по правому столбцу
+        x, o = transform(board.x, board.o, 1)
+        self.assertEqual(cache.get(x, o), (CELL_MAPS[1][2], 1))
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.hits, 1)
+
+        cache.discard(x, o)
+        self.assertIsNone(cache.get(board.x, board.o))
+
+
+if __name__ == '__main__':
+    unittest.main()
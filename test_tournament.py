@@ -0,0 +1,80 @@
+"""
+Юнит-тесты для турнира стратегий
+"""
+
+import json
+import random
+import unittest
+
+from engine import BitBoard
+from game import heuristic_move, simple_move
+from strategies import get_strategy
+from tournament import elo_ratings, play_chunk, play_game, run_tournament
+
+
+class TestStrategies(unittest.TestCase):
+    """Юнит-тесты для реестра стратегий"""
+
+    def test_simple_order(self):
+        """Тест: SimpleAI берёт центр, затем углы"""
+        board = BitBoard()
+        self.assertEqual(simple_move(board), 4)
+        board.make_move(4)
+        self.assertEqual(simple_move(board), 0)
+
+    def test_heuristic_blocks(self):
+        """Тест: эвристика блокирует угрозу"""
+        board = BitBoard.from_cells(['X', 'X', '', '', 'O', '', '', '', ''])
+        self.assertEqual(heuristic_move(board, random.Random(0)), 2)
+
+    def test_unknown_strategy(self):
+        """Тест: неизвестная стратегия - ошибка"""
+        with self.assertRaises(ValueError):
+            get_strategy('nope')
+
+
+class TestTournament(unittest.TestCase):
+    """Юнит-тесты для кругового турнира"""
+
+    def test_solver_never_loses(self):
+        """Тест: решатель не проигрывает случайной игре"""
+        wins, draws, losses, _, _ = play_chunk('solver', 'random', 40, True, 1)
+        self.assertEqual(wins + draws + losses, 40)
+        self.assertEqual(losses, 0)
+
+    def test_play_game_result(self):
+        """Тест: SimpleAI против себя - одна и та же партия"""
+        simple = get_strategy('simple')
+        rng = random.Random(0)
+        self.assertEqual(play_game(simple, simple, rng), play_game(simple, simple, rng))
+
+    def test_elo_order(self):
+        """Тест: сильная стратегия получает больший рейтинг"""
+        matrix = {
+            'a': {'b': {'wins': 9, 'draws': 1, 'losses': 0}},
+            'b': {'a': {'wins': 0, 'draws': 1, 'losses': 9}},
+        }
+        ratings = elo_ratings(['a', 'b'], matrix)
+        self.assertGreater(ratings['a'], ratings['b'])
+        self.assertAlmostEqual(ratings['a'] + ratings['b'], 3000, places=0)
+
+    def test_run_tournament_json(self):
+        """Тест: отчёт турнира сериализуется в JSON"""
+        report = run_tournament(['random', 'simple', 'solver'], games_per_pair=10, workers=2, seed=1)
+        self.assertEqual(report['games'], 30)
+        matrix = report['matrix']
+        self.assertEqual(matrix['solver']['random']['losses'], 0)
+        self.assertEqual(matrix['random']['simple']['wins'], matrix['simple']['random']['losses'])
+        self.assertTrue(report['workers'])
+        json.dumps(report)
+
+    def test_every_strategy_on_large_board(self):
+        """Тест: все стратегии играют на поле 7x7 (решатель - через поиск)"""
+        report = run_tournament(['simple', 'solver'], games_per_pair=2, workers=1, seed=1,
+                                rows=7, cols=7, k=4)
+        self.assertEqual(report['games'], 2)
+        self.assertEqual(report['board'], [7, 7, 4])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+"""
+Юнит-тесты для приложения без окна: касания поля в игре с ИИ
+"""
+
+import os
+import tempfile
+import unittest
+
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+os.environ.setdefault('KIVY_NO_CONSOLELOG', '1')
+
+try:
+    from ui import TicTacToeApp
+except ImportError:
+    TicTacToeApp = None
+
+
+@unittest.skipIf(TicTacToeApp is None, "Kivy не установлен")
+class TestAppTaps(unittest.TestCase):
+    """Юнит-тесты для касаний поля против ИИ"""
+
+    def setUp(self):
+        from stats import StatsStore
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.app = TicTacToeApp()
+        self.app.stats = StatsStore(os.path.join(self.tmpdir.name, 'stats.db'))
+        self.app.root = self.app.build()
+
+    def tearDown(self):
+        self.app.on_stop()
+        self.tmpdir.cleanup()
+
+    def test_second_tap_before_ai(self):
+        """Тест: касание до ответа ИИ не ставит O за него"""
+        self.app.start_game('ai')
+        self.app.board_view.dispatch('on_cell', 0)
+        # Ход ИИ ещё только запланирован: Clock не тикал
+        self.assertFalse(self.app.ai_thinking)
+        self.app.board_view.dispatch('on_cell', 8)
+        self.assertEqual(self.app.board, ['X', '', '', '', '', '', '', '', ''])
+        self.assertEqual(self.app.current_player, 'O')
+
+    def test_friend_mode_taps_both_sides(self):
+        """Тест: в игре вдвоём касания ставят X и O по очереди"""
+        self.app.start_game('friend')
+        self.app.board_view.dispatch('on_cell', 0)
+        self.app.board_view.dispatch('on_cell', 8)
+        self.assertEqual(self.app.board[0], 'X')
+        self.assertEqual(self.app.board[8], 'O')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+"""
+Круговой турнир стратегий ИИ с рейтингом Эло
+Партии раздаются пулу процессов, очерёдность первого хода чередуется
+
+Запуск: python tournament.py [партий на пару] [процессы] [файл.json] [стратегии...]
+"""
+
+import itertools
+import json
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from mnk import make_board
+from strategies import STRATEGIES, get_strategy
+
+BASE_RATING = 1500
+
+# Партий в одном задании для процесса
+CHUNK = 50
+
+
+def play_game(strategy_x, strategy_o, rng, rows=3, cols=3, k=3):
+    """Одна партия; возвращает 'X', 'O' или None при ничьей"""
+    board = make_board(rows, cols, k)
+    players = {'X': strategy_x, 'O': strategy_o}
+    while True:
+        move = players[board.current_player](board, rng)
+        if move is None or not board.make_move(move):
+            raise ValueError(f"Недопустимый ход {move}")
+        winner = board.winner()
+        if winner is not None:
+            return winner
+        if board.is_full():
+            return None
+
+
+def play_chunk(name_a, name_b, games, a_first, seed, rows=3, cols=3, k=3):
+    """Пакет партий между двумя стратегиями для одного процесса
+
+    Возвращает (победы a, ничьи, победы b, время, pid).
+    """
+    started = time.perf_counter()
+    rng = random.Random(seed)
+    strategy_a, strategy_b = get_strategy(name_a), get_strategy(name_b)
+    wins_a = draws = wins_b = 0
+    for i in range(games):
+        # Чередуем, кто ходит первым
+        a_is_x = (i % 2 == 0) == a_first
+        if a_is_x:
+            winner = play_game(strategy_a, strategy_b, rng, rows, cols, k)
+        else:
+            winner = play_game(strategy_b, strategy_a, rng, rows, cols, k)
+        if winner is None:
+            draws += 1
+        elif (winner == 'X') == a_is_x:
+            wins_a += 1
+        else:
+            wins_b += 1
+    return wins_a, draws, wins_b, time.perf_counter() - started, os.getpid()
+
+
+def elo_ratings(names, matrix, iterations=200):
+    """Рейтинги Эло по модели Брэдли-Терри (ничья - пол-очка)
+
+    Каждой паре добавляется одна виртуальная ничья, чтобы рейтинги
+    оставались конечными даже у стратегии без единого очка.
+    """
+    games = {}
+    score = {name: 0.0 for name in names}
+    for a, b in itertools.combinations(names, 2):
+        result = matrix[a][b]
+        n = result['wins'] + result['draws'] + result['losses'] + 1
+        games[a, b] = games[b, a] = n
+        score[a] += result['wins'] + 0.5 * result['draws'] + 0.5
+        score[b] += result['losses'] + 0.5 * result['draws'] + 0.5
+
+    strength = {name: 1.0 for name in names}
+    for _ in range(iterations):
+        updated = {}
+        for a in names:
+            denominator = sum(games[a, b] / (strength[a] + strength[b]) for b in names if b != a)
+            updated[a] = score[a] / denominator if denominator else 1.0
+        mean = math.exp(sum(math.log(v) for v in updated.values()) / len(updated))
+        strength = {name: value / mean for name, value in updated.items()}
+    return {name: round(BASE_RATING + 400 * math.log10(strength[name]), 1) for name in names}
+
+
+def run_tournament(names=None, games_per_pair=100, workers=None, seed=None, rows=3, cols=3, k=3):
+    """Круговой турнир; результат - словарь, готовый к записи в JSON"""
+    names = list(names or STRATEGIES)
+    for name in names:
+        get_strategy(name)
+    workers = workers or os.cpu_count() or 1
+    rng = random.Random(seed)
+
+    jobs = []
+    for a, b in itertools.combinations(names, 2):
+        for start in range(0, games_per_pair, CHUNK):
+            games = min(CHUNK, games_per_pair - start)
+            # Пакеты по очереди начинает то a, то b
+            a_first = start // CHUNK % 2 == 0
+            jobs.append((a, b, games, a_first, rng.randrange(1 << 30), rows, cols, k))
+
+    matrix = {a: {b: {'wins': 0, 'draws': 0, 'losses': 0} for b in names if b != a} for a in names}
+    worker_games = {}
+    worker_time = {}
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for job, result in zip(jobs, pool.map(play_chunk, *zip(*jobs))):
+            a, b, games = job[:3]
+            wins_a, draws, wins_b, elapsed, pid = result
+            for x, y, wins, losses in ((a, b, wins_a, wins_b), (b, a, wins_b, wins_a)):
+                matrix[x][y]['wins'] += wins
+                matrix[x][y]['draws'] += draws
+                matrix[x][y]['losses'] += losses
+            worker_games[pid] = worker_games.get(pid, 0) + games
+            worker_time[pid] = worker_time.get(pid, 0.0) + elapsed
+    elapsed = time.perf_counter() - started
+
+    total = sum(job[2] for job in jobs)
+    return {
+        'strategies': names,
+        'board': [rows, cols, k],
+        'games_per_pair': games_per_pair,
+        'games': total,
+        'elapsed': round(elapsed, 3),
+        'games_per_second': round(total / elapsed, 1) if elapsed else 0.0,
+        'workers': {
+            str(pid): round(worker_games[pid] / worker_time[pid], 1) if worker_time[pid] else 0.0
+            for pid in worker_games
+        },
+        'matrix': matrix,
+        'elo': elo_ratings(names, matrix),
+    }
+
+
+if __name__ == '__main__':
+    games_per_pair = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    output = sys.argv[3] if len(sys.argv) > 3 else None
+    names = sys.argv[4:] or None
+
+    report = run_tournament(names, games_per_pair, workers)
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    print(text)
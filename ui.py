@@ -0,0 +1,629 @@
+"""
+Интерфейс Kivy; импортируется только при запуске приложения
+До первого кадра загружается только то, что нужно для меню: анимации,
+окно результата, экран игры, книга ходов и база статистики
+подгружаются при первом обращении или сразу после первого кадра
+"""
+
+from kivy.app import App
+from kivy.uix.button import Button
+from kivy.uix.label import Label
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.screenmanager import ScreenManager, Screen
+from kivy.properties import NumericProperty, StringProperty, BooleanProperty
+from kivy.clock import Clock
+from kivy.metrics import sp, dp
+from kivy.utils import platform
+import os
+import time
+
+from ai_worker import AIWorker
+from game import TicTacToeGame, choose_ai_move
+from mnk import BOARD_VARIANTS
+from profiling import profiler_from_env, startup_report_from_env
+
+IMPORTED = time.perf_counter()
+
+# Конфигурация для Android
+if platform == 'android':
+    from android.runnable import run_on_ui_thread
+    from jnius import autoclass
+
+class MainMenuScreen(Screen):
+    pass
+
+class GameScreen(Screen):
+    pass
+
+class AnimatedButton(Button):
+    scale = NumericProperty(1)
+    
+    def on_press(self):
+        app = App.get_running_app()
+        if app is not None:
+            app.animate('press', self)
+
+# Методы, время которых пишется при включённом профилировании
+PROFILED_METHODS = ('make_move', 'make_ai_move', 'check_game_result', 'create_result_popup', 'show_popup')
+
+class TicTacToeApp(TicTacToeGame, App):
+    current_player = StringProperty('X')
+    game_active = BooleanProperty(True)
+    player_x_score = NumericProperty(0)
+    player_o_score = NumericProperty(0)
+    ties = NumericProperty(0)
+    game_mode = StringProperty('friend')
+    board_variant = NumericProperty(0)
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.startup = startup_report_from_env()
+        if self.startup is not None:
+            self.startup.mark('import', IMPORTED)
+        # Книга ходов открывается при первом ходе ИИ, в потоке ИИ
+        self.book = None
+        self.book_opened = False
+        # ИИ считает в фоновом потоке, результат приходит через Clock
+        self.ai_worker = AIWorker(post=lambda callback: Clock.schedule_once(lambda dt: callback()))
+        self.ai_thinking = False
+        # Экран игры создаётся при первом запуске партии
+        self.game_screen = None
+        self.game_layout = None
+        self.board_view = None
+        # Окно результата переиспользуется между партиями
+        self.result_popup = None
+        # Анимации идут через общий менеджер, он создаётся при первой анимации
+        self.animations = None
+        # Профилирование по TICTACTOE_PROFILE; выключенное ничего не оборачивает
+        self.profiler = profiler_from_env()
+        if self.profiler is not None:
+            self.profiler.instrument(self, PROFILED_METHODS)
+        if self.startup is not None:
+            self.startup.mark('init')
+    
+    def get_book(self):
+        """Книга ходов; нужна только ИИ на 3x3, поэтому файл (или его сборка) открывается в потоке ИИ, а не при старте"""
+        if not self.book_opened:
+            from opening_book import open_book
+            self.book = open_book()
+            self.book_opened = True
+        return self.book
+    
+    def open_stats(self):
+        """База статистики: итоги партий пишутся пачками в фоновом потоке"""
+        if self.stats is None:
+            from stats import StatsStore
+            self.stats = StatsStore(
+                self.stats_path(),
+                post=lambda callback: Clock.schedule_once(lambda dt: callback())
+            )
+        return self.stats
+    
+    def on_first_frame(self, *args):
+        """Первый кадр на экране: отчёт о запуске и то, что отложено до него"""
+        from kivy.core.window import Window
+        Window.unbind(on_flip=self.on_first_frame)
+        if self.startup is not None:
+            self.startup.mark('first_frame')
+            print(self.startup.format())
+        self.open_stats()
+    
+    def animate(self, name, widget):
+        """Запускает эффект, отменив его незаконченный запуск на том же виджете"""
+        if self.animations is None:
+            from animations import AnimationManager
+            self.animations = AnimationManager()
+        self.animations.play(name, widget)
+    
+    def stop_animations(self, widget):
+        if self.animations is not None:
+            self.animations.reset(widget)
+    
+    def profile_frame(self, dt):
+        self.profiler.frame(dt)
+        if self.animations is not None:
+            self.profiler.gauge('active_animations', self.animations.active_count)
+    
+    def stats_path(self):
+        """База статистики в каталоге данных приложения, иначе рядом с игрой"""
+        try:
+            return os.path.join(self.user_data_dir, 'stats.db')
+        except OSError:
+            # Kivy создаёт каталог данных без родителей и падает, если их нет
+            from stats import DEFAULT_PATH
+            return DEFAULT_PATH
+    
+    def build(self):
+        from kivy.core.window import Window
+        
+        # Настройка для Android
+        if platform == 'android':
+            self.disable_android_gestures()
+        
+        if self.profiler is not None:
+            # Интервал 0 - вызов на каждом кадре
+            Clock.schedule_interval(self.profile_frame, 0)
+        
+        self.sm = ScreenManager()
+        
+        # Главное меню
+        menu_screen = MainMenuScreen(name='menu')
+        menu_layout = BoxLayout(orientation='vertical', padding=dp(30), spacing=dp(20))
+        
+        title_label = Label(
+            text='[b]Крестики-нолики[/b]',
+            font_size=sp(36),
+            markup=True,
+            size_hint=(1, 0.3)
+        )
+        menu_layout.add_widget(title_label)
+        
+        mode_label = Label(
+            text='Выберите режим игры:',
+            font_size=sp(22),
+            size_hint=(1, 0.2)
+        )
+        menu_layout.add_widget(mode_label)
+        
+        mode_layout = BoxLayout(orientation='vertical', spacing=dp(15), size_hint=(1, 0.5))
+        
+        vs_friend_btn = AnimatedButton(
+            text='Играть с другом',
+            font_size=sp(20),
+            background_color=(0.2, 0.6, 0.2, 1),
+            background_normal='',
+            size_hint_y=None,
+            height=dp(60),
+            on_press=lambda x: self.start_game('friend')
+        )
+        
+        vs_ai_btn = AnimatedButton(
+            text='Играть с ИИ',
+            font_size=sp(20),
+            background_color=(0.2, 0.4, 0.8, 1),
+            background_normal='',
+            size_hint_y=None,
+            height=dp(60),
+            on_press=lambda x: self.start_game('ai')
+        )
+        
+        self.size_btn = Button(
+            text=self.get_size_text(),
+            font_size=sp(18),
+            background_color=(0.4, 0.4, 0.4, 1),
+            background_normal='',
+            size_hint_y=None,
+            height=dp(50),
+            on_press=self.next_board_variant
+        )
+        
+        mode_layout.add_widget(vs_friend_btn)
+        mode_layout.add_widget(vs_ai_btn)
+        mode_layout.add_widget(self.size_btn)
+        menu_layout.add_widget(mode_layout)
+        
+        menu_screen.add_widget(menu_layout)
+        self.sm.add_widget(menu_screen)
+        # Экран игры создаётся при первом переходе на него
+        
+        # Обработка кнопки "Назад" на Android
+        self._keyboard = Window.request_keyboard(self._keyboard_closed, self)
+        self._keyboard.bind(on_key_down=self._on_keyboard_down)
+        
+        Window.bind(on_flip=self.on_first_frame)
+        if self.startup is not None:
+            self.startup.mark('build')
+        return self.sm
+    
+    def disable_android_gestures(self):
+        """Отключает системные жесты на Android"""
+        try:
+            @run_on_ui_thread
+            def disable_gestures():
+                PythonActivity = autoclass('org.kivy.android.PythonActivity')
+                View = autoclass('android.view.View')
+                
+                activity = PythonActivity.mActivity
+                window = activity.getWindow()
+                decor_view = window.getDecorView()
+                
+                # Скрываем панель навигации
+                flags = (View.SYSTEM_UI_FLAG_HIDE_NAVIGATION | 
+                        View.SYSTEM_UI_FLAG_FULLSCREEN |
+                        View.SYSTEM_UI_FLAG_IMMERSIVE_STICKY)
+                decor_view.setSystemUiVisibility(flags)
+            
+            disable_gestures()
+        except Exception as e:
+            print(f"Не удалось отключить жесты: {e}")
+    
+    def _keyboard_closed(self):
+        self._keyboard.unbind(on_key_down=self._on_keyboard_down)
+        self._keyboard = None
+    
+    def _on_keyboard_down(self, keyboard, keycode, text, modifiers):
+        """Обработка кнопки Назад на Android, F12 - выгрузка профиля"""
+        if keycode[1] == 'f12' and self.profiler is not None:
+            print(f"Профиль сохранён: {self.profiler.dump()}")
+            return True
+        if keycode[1] == 'escape' or keycode[1] == 'backspace':
+            if self.sm.current == 'game':
+                self.back_to_menu()
+                return True  # Блокируем стандартное поведение
+        return False
+
+    def get_size_text(self):
+        return f'Поле: {BOARD_VARIANTS[self.board_variant][3]}'
+    
+    def next_board_variant(self, instance=None):
+        self.board_variant = (self.board_variant + 1) % len(BOARD_VARIANTS)
+        self.size_btn.text = self.get_size_text()
+    
+    def start_game(self, mode):
+        self.game_mode = mode
+        rows, cols, k, _ = BOARD_VARIANTS[self.board_variant]
+        self.resize(rows, cols, k)
+        self.reset_game()
+        # Счёт режима и поля подгрузится из базы, не задерживая показ экрана
+        self.open_stats()
+        self.load_scores()
+        self.build_game_screen()
+        self.sm.current = 'game'
+    
+    def build_game_screen(self):
+        """Экран игры строится один раз, дальше только перенастраивается"""
+        if self.game_screen is None:
+            self.game_screen = GameScreen(name='game')
+            self.sm.add_widget(self.game_screen)
+        if self.game_layout is None:
+            self.create_game_screen()
+        self.configure_game_screen()
+        
+        if self.game_mode == 'ai' and self.current_player == 'O':
+            Clock.schedule_once(lambda dt: self.make_ai_move(), 0.5)
+
+    def create_game_screen(self):
+        from board_widget import BoardWidget
+        
+        main_layout = BoxLayout(orientation='vertical', padding=dp(15), spacing=dp(10))
+        
+        # Верхняя панель
+        top_panel = BoxLayout(orientation='horizontal', size_hint=(1, 0.12), spacing=dp(10))
+        
+        back_btn = Button(
+            text='← Меню',
+            font_size=sp(16),
+            size_hint=(0.25, 1),
+            background_color=(0.5, 0.5, 0.5, 1),
+            background_normal='',
+            on_press=self.back_to_menu
+        )
+        
+        self.mode_info = Label(
+            text='',
+            font_size=sp(16),
+            halign='center'
+        )
+        
+        self.score_label = Label(
+            text='',
+            font_size=sp(14),
+            halign='right'
+        )
+        
+        top_panel.add_widget(back_btn)
+        top_panel.add_widget(self.mode_info)
+        top_panel.add_widget(self.score_label)
+        main_layout.add_widget(top_panel)
+        
+        # Статус игры
+        self.status_label = Label(
+            text='',
+            font_size=sp(20),
+            markup=True,
+            size_hint=(1, 0.1)
+        )
+        main_layout.add_widget(self.status_label)
+        
+        # Игровое поле - один виджет, клетка касания находится арифметикой
+        self.board_view = BoardWidget(size_hint=(1, 0.6))
+        self.board_view.bind(on_cell=lambda instance, position: self.tap_cell(position))
+        main_layout.add_widget(self.board_view)
+        
+        # Панель управления
+        self.control_layout = BoxLayout(orientation='horizontal', spacing=dp(5), size_hint=(1, 0.15))
+        
+        # Увеличиваем кнопки для сенсорного ввода
+        new_game_btn = Button(
+            text='Новая игра',
+            font_size=sp(18),
+            background_color=(0.2, 0.7, 0.3, 1),
+            background_normal='',
+            on_press=self.reset_game
+        )
+        
+        # Кнопка хода ИИ создаётся сразу, а показывается только в режиме с ИИ
+        self.ai_move_btn = Button(
+            text='Ход ИИ',
+            font_size=sp(18),
+            background_color=(0.3, 0.5, 0.8, 1),
+            background_normal='',
+            on_press=self.make_ai_move
+        )
+        
+        undo_btn = Button(
+            text='Отменить',
+            font_size=sp(18),
+            background_color=(0.5, 0.5, 0.5, 1),
+            background_normal='',
+            on_press=self.undo_move
+        )
+        
+        redo_btn = Button(
+            text='Повторить',
+            font_size=sp(18),
+            background_color=(0.5, 0.5, 0.5, 1),
+            background_normal='',
+            on_press=self.redo_move
+        )
+        
+        self.control_layout.add_widget(undo_btn)
+        self.control_layout.add_widget(redo_btn)
+        self.control_layout.add_widget(new_game_btn)
+        main_layout.add_widget(self.control_layout)
+        
+        self.game_layout = main_layout
+        self.game_screen.add_widget(main_layout)
+    
+    def configure_game_screen(self):
+        """Обновляет подписи, кнопку ИИ и клетки под текущий режим и поле"""
+        self.mode_info.text = f'Режим: {"с другом" if self.game_mode == "friend" else "с ИИ"}, {BOARD_VARIANTS[self.board_variant][3]}'
+        self.update_score_display()
+        self.status_label.text = self.get_status_text()
+        
+        if self.game_mode == 'ai' and self.ai_move_btn.parent is None:
+            # Кнопка ИИ стоит перед кнопкой новой игры
+            self.control_layout.add_widget(self.ai_move_btn, index=len(self.control_layout.children))
+        elif self.game_mode != 'ai' and self.ai_move_btn.parent is not None:
+            self.control_layout.remove_widget(self.ai_move_btn)
+        
+        self.render_board()
+    
+    # Остальные методы остаются без изменений...
+    def get_status_text(self):
+        if self.game_mode == 'friend':
+            color = "ff5555" if self.current_player == 'X' else "5555ff"
+            return f"[b]Ходит игрок:[/b] [color={color}]{self.current_player}[/color]"
+        else:
+            if self.current_player == 'X':
+                return "[b]Ваш ход[/b] [color=ff5555](X)[/color]"
+            elif self.ai_thinking:
+                return "[b]ИИ думает...[/b] [color=5555ff](O)[/color]"
+            else:
+                return "[b]Ходит ИИ[/b] [color=5555ff](O)[/color]"
+    
+    def tap_cell(self, position):
+        """Касание клетки; против ИИ ход O делает только ИИ, даже пока его расчёт не начался"""
+        if self.game_mode == 'ai' and self.current_player == 'O':
+            return
+        self.make_move(position)
+    
+    def make_move(self, position):
+        if not self.game_active or self.ai_thinking or not self.engine.is_empty(position):
+            return
+        
+        self.place(position)
+        
+        # Анимируется масштаб готовой текстуры знака, а не размер шрифта
+        self.board_view.pop(position)
+        self.paint_cell(position)
+        self.animate('pop', self.board_view)
+        
+        self.check_game_result()
+    
+    def paint_cell(self, position):
+        """Приводит клетку поля в соответствие с доской"""
+        self.board_view.set_cell(position, self.engine[position])
+    
+    def render_board(self):
+        """Приводит поле к доске; перерисовываются только изменившиеся клетки"""
+        self.board_view.resize(self.engine.rows, self.engine.cols)
+        return self.show_cells(self.engine.cells(), self.engine.winning_line() or ())
+    
+    def show_cells(self, cells, line=()):
+        """Показывает позицию (доска, повтор записи, состояние с сервера) без анимаций"""
+        self.stop_animations(self.board_view)
+        self.board_view.pop(None)
+        return self.board_view.render(cells, line)
+    
+    def undo_move(self, instance=None):
+        self.cancel_ai()
+        self.apply_history(self.undo)
+    
+    def redo_move(self, instance=None):
+        self.cancel_ai()
+        self.apply_history(self.redo)
+    
+    def apply_history(self, step):
+        """Отмена или повтор: перерисовываются только изменившиеся клетки"""
+        step()
+        self.render_board()
+        # Подсветка победной линии снимается вместе с линией
+        if self.engine.winning_line():
+            self.highlight_winning_line()
+        self.status_label.text = self.get_status_text()
+        
+        if self.game_active and self.game_mode == 'ai' and self.current_player == 'O':
+            Clock.schedule_once(lambda dt: self.make_ai_move(), 0.3)
+    
+    def make_ai_move(self, instance=None):
+        if not self.game_active or self.current_player != 'O' or self.game_mode != 'ai':
+            return
+        
+        # Поиск идёт на копии доски, чтобы интерфейс не видел пробных ходов
+        board = self.engine.copy()
+        self.ai_thinking = True
+        self.status_label.text = self.get_status_text()
+        # Книга ходов или точный решатель: ИИ никогда не проигрывает.
+        # Книга нужна только на 3x3 и открывается в потоке ИИ
+        token = self.ai_worker.submit(
+            lambda token: choose_ai_move(board, self.get_book() if board.size == 9 else None, token),
+            lambda move, elapsed: self.on_ai_move_ready(move, elapsed, token)
+        )
+    
+    def on_ai_move_ready(self, move, elapsed, token):
+        if self.profiler is not None:
+            self.profiler.record('ai_compute', elapsed)
+        if move is None:
+            # Хода нет (или поиск упал): снимаем "ИИ думает", поле снова принимает ходы
+            self.ai_thinking = False
+            self.status_label.text = self.get_status_text()
+            return
+        # Пауза "на раздумье" не растёт из-за времени самого поиска
+        Clock.schedule_once(lambda dt: self.execute_ai_move(move, token), max(0, 0.7 - elapsed))
+    
+    def cancel_ai(self):
+        """Прерывает поиск ИИ и отменяет его отложенный ход"""
+        self.ai_worker.cancel()
+        self.ai_thinking = False
+    
+    def execute_ai_move(self, position, token=None):
+        if token is not None and token.cancelled:
+            return
+        self.ai_thinking = False
+        if self.game_active and self.engine.is_empty(position):
+            self.make_move(position)
+    
+    def check_game_result(self):
+        winner = self.check_winner()
+        
+        if winner:
+            self.game_active = False
+            self.show_winner_popup(winner)
+            self.update_score(winner)
+            self.record_result(winner)
+            self.highlight_winning_line()
+        elif self.engine.is_full():
+            self.game_active = False
+            self.show_tie_popup()
+            self.ties += 1
+            self.update_score_display()
+            self.record_result(None)
+        else:
+            self.switch_player()
+            self.status_label.text = self.get_status_text()
+            
+            if self.game_mode == 'ai' and self.current_player == 'O':
+                Clock.schedule_once(lambda dt: self.make_ai_move(), 0.3)
+    
+    def highlight_winning_line(self):
+        line = self.engine.winning_line()
+        if line:
+            self.board_view.set_line(line)
+            self.animate('highlight', self.board_view)
+    
+    def show_winner_popup(self, winner):
+        if self.game_mode == 'friend':
+            message = f'Игрок [color=ff5555]{winner}[/color] побеждает!' if winner == 'X' else f'Игрок [color=5555ff]{winner}[/color] побеждает!'
+        else:
+            if winner == 'X':
+                message = '[color=00ff00]Вы победили![/color] 🎉'
+            else:
+                message = '[color=ff0000]ИИ победил![/color] 🤖'
+        
+        self.show_popup('Игра окончена!', message)
+    
+    def show_tie_popup(self):
+        self.show_popup('Игра окончена!', 'Ничья! 🤝')
+    
+    def create_result_popup(self):
+        """Окно результата создаётся один раз; кнопки привязаны к методам, а не к новым лямбдам"""
+        content = BoxLayout(orientation='vertical', spacing=dp(10), padding=dp(20))
+        
+        self.result_label = Label(
+            text='',
+            font_size=sp(22),
+            markup=True
+        )
+        
+        button_layout = BoxLayout(orientation='horizontal', spacing=dp(10), size_hint_y=0.4)
+        
+        menu_btn = Button(
+            text='В меню',
+            font_size=sp(18),
+            background_color=(0.5, 0.5, 0.5, 1),
+            on_press=self.on_popup_menu
+        )
+        
+        again_btn = Button(
+            text='Играть ещё',
+            font_size=sp(18),
+            background_color=(0.2, 0.7, 0.3, 1),
+            on_press=self.on_popup_again
+        )
+        
+        button_layout.add_widget(menu_btn)
+        button_layout.add_widget(again_btn)
+        
+        content.add_widget(self.result_label)
+        content.add_widget(button_layout)
+        
+        from kivy.uix.popup import Popup
+        self.result_popup = Popup(
+            title='',
+            content=content,
+            size_hint=(0.8, 0.5),
+            auto_dismiss=False
+        )
+    
+    def show_popup(self, title, message):
+        if self.result_popup is None:
+            self.create_result_popup()
+        self.result_popup.title = title
+        self.result_label.text = message
+        self.result_popup.open()
+    
+    def on_popup_menu(self, instance=None):
+        self.result_popup.dismiss()
+        self.back_to_menu()
+    
+    def on_popup_again(self, instance=None):
+        self.result_popup.dismiss()
+        self.reset_game()
+    
+    def update_score(self, winner):
+        super().update_score(winner)
+        self.update_score_display()
+    
+    def add_totals(self, totals):
+        super().add_totals(totals)
+        self.update_score_display()
+    
+    def update_score_display(self):
+        if self.game_layout is None:
+            return
+        self.score_label.text = f"X: {self.player_x_score} | O: {self.player_o_score} | Ничьи: {self.ties}"
+    
+    def reset_game(self, instance=None):
+        self.cancel_ai()
+        super().reset_game()
+        
+        if self.board_view is not None:
+            self.render_board()
+        
+        if hasattr(self, 'status_label'):
+            self.status_label.text = self.get_status_text()
+        
+        if self.game_mode == 'ai' and self.current_player == 'O':
+            Clock.schedule_once(lambda dt: self.make_ai_move(), 0.5)
+    
+    def back_to_menu(self, instance=None):
+        self.cancel_ai()
+        self.sm.current = 'menu'
+    
+    def on_stop(self):
+        self.ai_worker.shutdown()
+        if self.stats is not None:
+            self.stats.close()
+        if self.profiler is not None:
+            self.profiler.dump()